@@ -0,0 +1,74 @@
+""" Benchmark: uncached vs cached HTML fragments
+
+多数のページが同じ Tray を共有するサイトを、毎回すべての Item を生成し直す
+以前の方法と、断片をキャッシュする現在の方法とで生成する時間を比較する
+リンクを 1 つ変更した後に全ページを生成し直す時間も計測する
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(
+    os.path.dirname(__file__), os.pardir, "design_pattern", "abstract_factory"
+))
+
+from factory import ListFactory  # noqa: E402
+
+
+def uncached_html(fragment) -> str:
+    """ make_html() as it was before caching: render every child again.
+    """
+    saved = []
+    stack = [fragment]
+    while stack:
+        f = stack.pop()
+        saved.append(f)
+        f._html = None
+        stack.extend(getattr(f, "tray", getattr(f, "content", [])))
+    html = fragment.make_html()
+    for f in saved:
+        f._html = None
+    return html
+
+
+def make_site(pages: int, trays: int, links: int):
+    factory = ListFactory()
+    shared = []
+    for i in range(trays):
+        tray = factory.create_tray(f"tray {i}")
+        for j in range(links):
+            tray.add(factory.create_link(f"link {j}", f"http://{i}.{j}/"))
+        shared.append(tray)
+
+    site = []
+    for i in range(pages):
+        page = factory.create_page(f"page {i}", "author")
+        for tray in shared:
+            page.add(tray)
+        site.append(page)
+    return site, shared
+
+
+if __name__ == "__main__":
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    site, shared = make_site(pages, 20, 50)
+
+    start = time.perf_counter()
+    expected = [uncached_html(page) for page in site]
+    uncached = time.perf_counter() - start
+
+    start = time.perf_counter()
+    html = [page.get_html() for page in site]
+    cached = time.perf_counter() - start
+    assert html == expected
+
+    shared[0].tray[0].url = "http://changed/"
+    start = time.perf_counter()
+    html = [page.get_html() for page in site]
+    changed = time.perf_counter() - start
+    assert html == [uncached_html(page) for page in site]
+
+    print(f"{pages} pages x 20 trays x 50 links")
+    print(f"  uncached:          {uncached * 1e3:9.2f}ms")
+    print(f"  cached, first run: {cached * 1e3:9.2f}ms")
+    print(f"  after one change:  {changed * 1e3:9.2f}ms")
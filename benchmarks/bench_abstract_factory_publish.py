@@ -0,0 +1,68 @@
+""" Benchmark: Page.output() one by one vs publish_all()
+
+多数のページを、output() で 1 ページずつ書き出す場合と、publish_all() で
+スレッド数を変えて書き出す場合とで比較する。内容が変わっていない状態で
+もう一度書き出す時間と、一部のページだけ変更した後の時間も計測する
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(
+    os.path.dirname(__file__), os.pardir, "design_pattern", "abstract_factory"
+))
+
+from factory import ListFactory  # noqa: E402
+from publish import publish_all  # noqa: E402
+
+
+def make_site(pages: int):
+    factory = ListFactory()
+    shared = factory.create_tray("Search Engine")
+    for i in range(50):
+        shared.add(factory.create_link(f"engine {i}", f"http://{i}/"))
+
+    site = []
+    for i in range(pages):
+        page = factory.create_page(f"page{i}", "author")
+        page.add(shared)
+        tray = factory.create_tray(f"links {i}")
+        for j in range(20):
+            tray.add(factory.create_link(f"link {j}", f"http://{i}/{j}"))
+        page.add(tray)
+        site.append(page)
+    return factory, site
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    factory, site = make_site(n)
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                for page in site:
+                    page.output()
+            print(f"{'output() serial':>24}: "
+                  f"{time.perf_counter() - start:7.2f}s")
+        finally:
+            os.chdir(cwd)
+
+    for workers in (1, 4, 16):
+        with tempfile.TemporaryDirectory() as tmp:
+            report = publish_all(site, tmp, workers)
+            print(f"{f'publish_all x{workers}':>24}: "
+                  f"{report.elapsed:7.2f}s ({len(report.written)} written)")
+            report = publish_all(site, tmp, workers)
+            print(f"{'unchanged':>24}: "
+                  f"{report.elapsed:7.2f}s ({len(report.skipped)} skipped)")
+            for page in site[::100]:
+                page.add(factory.create_link("new", "http://new/"))
+            report = publish_all(site, tmp, workers)
+            print(f"{'1% changed':>24}: "
+                  f"{report.elapsed:7.2f}s ({len(report.written)} written)")
@@ -0,0 +1,86 @@
+""" Benchmark: whole-string output vs streamed output of a large page
+
+リンクの数が非常に多いページを、全体を 1 つの文字列にしてから書き込む以前の
+output() と、iter_html() から少しずつ書き込む現在の output() とで、時間と
+メモリ使用量のピークを比較する
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(
+    os.path.dirname(__file__), os.pardir, "design_pattern", "abstract_factory"
+))
+
+from factory import ListFactory  # noqa: E402
+
+
+def make_page(trays: int, links: int):
+    factory = ListFactory()
+    page = factory.create_page("large", "author")
+    for i in range(trays):
+        tray = factory.create_tray(f"tray {i}")
+        for j in range(links):
+            tray.add(factory.create_link(f"link {j}", f"http://{i}/{j}"))
+        page.add(tray)
+    return page
+
+
+def whole_output(page) -> None:
+    """ output() as it was before streaming.
+    """
+    with open(f"{page.title}.html", mode="w", encoding="utf-8") as f:
+        f.write(page.make_html())
+
+
+def streamed_output(page) -> None:
+    page.output()
+
+
+def reset(page) -> None:
+    """ Drop the fragments cached by a previous run.
+    """
+    for tray in page.content:
+        for link in tray.tray:
+            link.invalidate()
+
+
+def measure(func, page) -> tuple[float, int]:
+    """ Time without tracing, then trace memory in a second run.
+    """
+    start = time.perf_counter()
+    func(page)
+    elapsed = time.perf_counter() - start
+    reset(page)
+
+    tracemalloc.start()
+    func(page)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    reset(page)
+    return elapsed, peak
+
+
+if __name__ == "__main__":
+    links = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    page = make_page(100, links // 100)
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            for label, func in (
+                ("whole string", whole_output),
+                ("streamed", streamed_output),
+            ):
+                with contextlib.redirect_stdout(io.StringIO()):
+                    elapsed, peak = measure(func, page)
+                size = os.path.getsize("large.html")
+                print(f"{label:>12}: {elapsed * 1e3:9.2f}ms, "
+                      f"peak {peak / 1024:10.1f}KiB "
+                      f"({size / 1024:.0f}KiB written)")
+        finally:
+            os.chdir(cwd)
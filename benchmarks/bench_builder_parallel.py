@@ -0,0 +1,45 @@
+""" Benchmark: build_many() over a process pool
+
+多数の文書を Director と TextBuilder / HTMLBuilder で組み立てるとき、
+プロセス数を変えて 1 秒あたりの文書数を比較する
+"""
+import os
+import sys
+import tempfile
+import time
+
+from design_pattern.builder import HTMLBuilder, StreamingHTMLBuilder
+from design_pattern.builder_parallel import build_many
+
+
+def make_specs(n: int) -> list[dict]:
+    return [
+        {
+            "title": f"Report {i}",
+            "sections": [
+                (f"section {j}", [f"item {i}-{j}-{k}" for k in range(20)])
+                for j in range(10)
+            ],
+        }
+        for i in range(n)
+    ]
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    specs = make_specs(n)
+    cpus = os.cpu_count() or 1
+    print(f"{n} documents, {cpus} cpus")
+
+    for workers in sorted({1, 2, 4, cpus}):
+        start = time.perf_counter()
+        build_many(specs, HTMLBuilder, workers=workers)
+        elapsed = time.perf_counter() - start
+        print(f"{workers:>3} workers, in memory: {n / elapsed:9.0f} docs/s")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = [os.path.join(tmp, f"{i}.html") for i in range(n)]
+            start = time.perf_counter()
+            build_many(specs, StreamingHTMLBuilder, workers, paths)
+            elapsed = time.perf_counter() - start
+        print(f"{workers:>3} workers, to files : {n / elapsed:9.0f} docs/s")
@@ -0,0 +1,72 @@
+""" Benchmark: buffered builders vs streaming builders
+
+大きな文書を組み立てたとき、断片をすべて保持して最後に結合する
+TextBuilder / HTMLBuilder と、少しずつファイルへ書き出す Streaming 版とで、
+時間とメモリ使用量のピークを比較する
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+from design_pattern.builder import (
+    Builder, Director, HTMLBuilder, StreamingHTMLBuilder,
+    StreamingTextBuilder, TextBuilder
+)
+
+
+class ReportDirector(Director):
+    """ Director that builds a report with many sections.
+    """
+
+    def __init__(self, builder: Builder, sections: int):
+        super().__init__(builder)
+        self.sections = sections
+
+    def construct(self) -> None:
+        self.builder.make_title("Report")
+        for i in range(self.sections):
+            self.builder.make_string(f"section {i}")
+            self.builder.make_items([f"item {i}-{j}" for j in range(10)])
+        self.builder.close()
+
+
+def build(make_builder, sections: int, trace: bool) -> tuple[float, int]:
+    with open(os.devnull, "w") as fp:
+        if trace:
+            tracemalloc.start()
+        start = time.perf_counter()
+        builder = make_builder(fp)
+        ReportDirector(builder, sections).construct()
+        if not hasattr(builder, "sink"):
+            fp.write(builder.get_result())
+        elapsed = time.perf_counter() - start
+        peak = 0
+        if trace:
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+    return elapsed, peak
+
+
+def measure(make_builder, sections: int) -> tuple[float, int]:
+    """ Time without tracing, then trace memory in a second run.
+    """
+    elapsed, _ = build(make_builder, sections, False)
+    _, peak = build(make_builder, sections, True)
+    return elapsed, peak
+
+
+if __name__ == "__main__":
+    largest = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    for sections in (1000, 10000, 100000):
+        if sections > largest:
+            break
+        for label, make_builder in (
+            ("TextBuilder", lambda fp: TextBuilder()),
+            ("StreamingTextBuilder", StreamingTextBuilder),
+            ("HTMLBuilder", lambda fp: HTMLBuilder()),
+            ("StreamingHTMLBuilder", StreamingHTMLBuilder),
+        ):
+            elapsed, peak = measure(make_builder, sections)
+            print(f"{sections:>7} sections {label:>21}: "
+                  f"{elapsed * 1e3:9.2f}ms, peak {peak / 1024:10.1f}KiB")
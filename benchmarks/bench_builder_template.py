@@ -0,0 +1,51 @@
+""" Benchmark: Director with builders vs compiled templates
+
+同じ形の文書をデータだけ変えて何度も組み立てたときの処理量を、Director と
+TextBuilder / HTMLBuilder で毎回組み立てる場合と、一度記録した
+CompiledTemplate に差し込む場合とで比較する
+"""
+import sys
+import time
+
+from design_pattern.builder import Director, HTMLBuilder, TextBuilder
+from design_pattern.builder_template import compile_director, Slot
+
+
+def make_data(n: int) -> list[dict]:
+    return [
+        dict(
+            title=f"Report {i}",
+            morning=[f"Good morning {i}", f"Good evening {i}"],
+            night=[f"Good night {i}", f"Good bye {i}"],
+        )
+        for i in range(n)
+    ]
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    data = make_data(n)
+    for builder_cls in (TextBuilder, HTMLBuilder):
+        start = time.perf_counter()
+        for d in data:
+            builder = builder_cls()
+            Director(builder, d["title"], [
+                ("from morning to noon", d["morning"]),
+                ("at night", d["night"]),
+            ]).construct()
+            expected = builder.get_result()
+        direct = time.perf_counter() - start
+
+        template = compile_director(builder_cls, Director, Slot("title"), [
+            ("from morning to noon", Slot("morning")),
+            ("at night", Slot("night")),
+        ])
+        start = time.perf_counter()
+        for d in data:
+            result = template.render(**d)
+        compiled = time.perf_counter() - start
+
+        assert result == expected
+        print(f"{builder_cls.__name__:>12}: "
+              f"Director {n / direct:10.0f} docs/s, "
+              f"compiled {n / compiled:10.0f} docs/s")
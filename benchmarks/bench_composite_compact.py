@@ -0,0 +1,82 @@
+""" Benchmark: composite object tree vs CompactTree
+
+同じ形のツリーを File / Directory オブジェクトと CompactTree の双方で構築し、
+メモリ使用量と構築・サイズ取得・一覧出力の処理時間を比較する
+ファイル名がディレクトリ間で共通な場合と、すべて異なる場合の両方を測る
+"""
+import contextlib
+import io
+import sys
+import time
+import tracemalloc
+
+from design_pattern.composite import Directory, File
+from design_pattern.composite_compact import CompactTree
+
+
+def make_rows(directories: int, files: int, unique: bool = False):
+    """ Yield (parent index, name, size) rows; root has index 0.
+    """
+    index = 0
+    for i in range(directories):
+        yield (0, f"dir{i}", None)
+        index += 1
+        parent = index
+        for j in range(files):
+            name = f"file_{i}_{j}.txt" if unique else f"file{j}.txt"
+            yield (parent, name, j)
+            index += 1
+
+
+def build_objects(rows) -> Directory:
+    nodes = [Directory("root")]
+    for parent, name, size in rows:
+        entry = Directory(name) if size is None else File(name, size)
+        nodes[parent].add(entry)
+        nodes.append(entry)
+
+    return nodes[0]
+
+
+def build_compact(rows):
+    tree = CompactTree("root")
+    tree.bulk_load(rows)
+    return tree.root
+
+
+def measure(build, rows):
+    tracemalloc.start()
+    root = build(rows)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del root
+
+    start = time.perf_counter()
+    root = build(rows)
+    built = time.perf_counter() - start
+
+    start = time.perf_counter()
+    root.get_size()
+    with contextlib.redirect_stdout(io.StringIO()):
+        root.print_list()
+    listed = time.perf_counter() - start
+
+    return memory, built, listed
+
+
+if __name__ == "__main__":
+    directories = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    files = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    for unique in (False, True):
+        rows = list(make_rows(directories, files, unique))
+        print(f"{len(rows) + 1} entries, "
+              f"{'unique' if unique else 'shared'} file names")
+        print(f"{'tree':>8} {'memory[MB]':>11} {'B/entry':>8} "
+              f"{'build[s]':>9} {'list[s]':>8}")
+        for label, build in (("object", build_objects),
+                             ("compact", build_compact)):
+            memory, built, listed = measure(build, rows)
+            print(
+                f"{label:>8} {memory / 2**20:>11.1f} "
+                f"{memory / len(rows):>8.0f} {built:>9.3f} {listed:>8.3f}"
+            )
@@ -0,0 +1,50 @@
+""" Benchmark: hash based diff vs comparing print_list output
+
+ほぼ同じ 2 つのツリーについて、一覧出力の全文を比較する方法と diff() とで
+1 つのファイルを変更したときの比較時間を比べる
+"""
+import time
+
+from design_pattern.composite import Directory, File
+from design_pattern.composite_diff import diff
+
+
+def make_tree(directories: int, files: int) -> Directory:
+    root = Directory("root")
+    for i in range(directories):
+        d = Directory(f"dir{i}")
+        root.add(d)
+        for j in range(files):
+            d.add(File(f"file{j}.txt", j))
+
+    return root
+
+
+def compare_listings(old: Directory, new: Directory) -> set:
+    return set(old.iter_list()) ^ set(new.iter_list())
+
+
+if __name__ == "__main__":
+    print(f"{'entries':>8} {'hash[s]':>8} {'listing[s]':>11} {'diff[ms]':>9}")
+    for directories in (100, 1000, 10000):
+        old = make_tree(directories, 100)
+        new = make_tree(directories, 100)
+
+        start = time.perf_counter()
+        old.get_hash()
+        new.get_hash()
+        hashed = time.perf_counter() - start
+
+        new.directory[directories // 2].directory[50].resize(1)
+
+        start = time.perf_counter()
+        compare_listings(old, new)
+        listing = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = diff(old, new)
+        elapsed = time.perf_counter() - start
+        assert len(result.resized) == 1
+
+        print(f"{directories * 101:>8} {hashed:>8.3f} {listing:>11.3f} "
+              f"{elapsed * 1e3:>9.3f}")
@@ -0,0 +1,91 @@
+""" Benchmark: PathIndex lookup vs recursive search
+
+ツリーを再帰的に辿ってパスを探す方法と、PathIndex による検索とで
+ツリーの大きさに対する検索時間の変化を比較する
+"**" を含む glob も、ツリーを辿って名前を照合する場合と比較する
+"""
+from fnmatch import fnmatchcase
+import random
+import time
+from typing import Optional
+
+from design_pattern.composite import Directory, Entry, File
+from design_pattern.composite_index import PathIndex
+
+
+def search(entry: Entry, path: str, prefix: str = "") -> Optional[Entry]:
+    """ Find path by walking the directory lists like callers do today.
+    """
+    current = f"{prefix}/{entry.get_name()}"
+    if current == path:
+        return entry
+    if not path.startswith(f"{current}/"):
+        return None
+    for child in entry.get_children():
+        found = search(child, path, current)
+        if found is not None:
+            return found
+
+    return None
+
+
+def walk_glob(root: Entry, pattern: str) -> list[Entry]:
+    """ Find entries under root whose name matches pattern by walking.
+    """
+    found = []
+    stack = [root]
+    while stack:
+        entry = stack.pop()
+        if fnmatchcase(entry.get_name(), pattern):
+            found.append(entry)
+        stack.extend(reversed(list(entry.get_children())))
+    return found
+
+
+def make_tree(directories: int, files: int) -> tuple[Directory, list[str]]:
+    root = Directory("root")
+    paths = []
+    for i in range(directories):
+        d = Directory(f"dir{i}")
+        root.add(d)
+        for j in range(files):
+            d.add(File(f"file{j}.html", j))
+            paths.append(f"/root/dir{i}/file{j}.html")
+
+    return root, paths
+
+
+if __name__ == "__main__":
+    queries = 1000
+    print(f"{'entries':>8} {'walk[us]':>9} {'index[us]':>10} "
+          f"{'glob[ms]':>9} {'walk **[ms]':>12} {'glob **[ms]':>12}")
+    for directories in (10, 100, 1000):
+        root, paths = make_tree(directories, 100)
+        targets = random.Random(0).choices(paths, k=queries)
+
+        start = time.perf_counter()
+        for path in targets[:100]:
+            search(root, path)
+        walk = (time.perf_counter() - start) / 100
+
+        index = PathIndex(root)
+        start = time.perf_counter()
+        for path in targets:
+            index.lookup(path)
+        lookup = (time.perf_counter() - start) / queries
+
+        start = time.perf_counter()
+        index.glob("/root/dir1/*.html")
+        glob = time.perf_counter() - start
+
+        start = time.perf_counter()
+        walked = walk_glob(root, "*.html")
+        walk_all = time.perf_counter() - start
+        start = time.perf_counter()
+        globbed = index.glob("/root/**/*.html")
+        glob_all = time.perf_counter() - start
+        assert len(globbed) == len(walked)
+
+        print(f"{len(paths):>8} {walk * 1e6:>9.1f} {lookup * 1e6:>10.2f} "
+              f"{glob * 1e3:>9.3f} {walk_all * 1e3:>12.2f} "
+              f"{glob_all * 1e3:>12.2f}")
@@ -0,0 +1,67 @@
+""" Benchmark: recursive print_list vs buffered write_list
+
+エントリごとに print() を呼ぶ再帰的な一覧出力と、明示的なスタックで走査して
+まとめて書き込む write_list() とを比較する
+"""
+import contextlib
+import os
+import sys
+import time
+
+from design_pattern.composite import Directory, Entry, File
+
+
+def recursive_print_list(entry: Entry, prefix: str = "") -> None:
+    """ print_list() as it was implemented before write_list().
+    """
+    print(f"{prefix}/{entry}")
+    for d in entry.get_children():
+        recursive_print_list(d, f"{prefix}/{entry.get_name()}")
+
+
+def make_tree(directories: int, files: int) -> Directory:
+    root = Directory("root")
+    for i in range(directories):
+        d = Directory(f"dir{i}")
+        root.add(d)
+        for j in range(files):
+            d.add(File(f"file{j}.txt", j))
+
+    return root
+
+
+if __name__ == "__main__":
+    directories = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    root = make_tree(directories, 100)
+
+    with open(os.devnull, "w") as fp:
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(fp):
+            recursive_print_list(root)
+        recursive = time.perf_counter() - start
+
+        start = time.perf_counter()
+        root.write_list(fp)
+        buffered = time.perf_counter() - start
+
+    print(f"recursive print_list: {recursive:.3f}s")
+    print(f"buffered write_list : {buffered:.3f}s "
+          f"({recursive / buffered:.1f}x)")
+
+    deep = Directory("root")
+    current = deep
+    for i in range(5000):
+        child = Directory(f"d{i}")
+        current.add(child)
+        current = child
+
+    try:
+        with open(os.devnull, "w") as fp, contextlib.redirect_stdout(fp):
+            recursive_print_list(deep)
+    except RecursionError:
+        print("recursive print_list on nested directories: RecursionError")
+
+    start = time.perf_counter()
+    count = sum(1 for _ in deep.iter_list())
+    print(f"iter_list over {count} nested directories: "
+          f"{time.perf_counter() - start:.3f}s")
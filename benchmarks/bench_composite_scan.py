@@ -0,0 +1,67 @@
+""" Benchmark: parallel scan() vs single-threaded os.walk
+
+一時ディレクトリにフィクスチャのツリーを生成し、os.walk で順に組み立てる方法と
+スレッドプールを使う scan() とで、ツリーの構築時間を比較する
+"""
+import os
+import sys
+import tempfile
+import time
+
+from design_pattern.composite import Directory, File
+from design_pattern.composite_scan import scan
+
+
+def make_fixture(root: str, width: int, depth: int, files: int) -> int:
+    count = 0
+    level = [root]
+    for _ in range(depth):
+        next_level = []
+        for parent in level:
+            for i in range(width):
+                d = os.path.join(parent, f"dir{i}")
+                os.mkdir(d)
+                next_level.append(d)
+                for j in range(files):
+                    with open(os.path.join(d, f"file{j}.txt"), "wb") as f:
+                        f.write(b"x" * j)
+                    count += 1
+        level = next_level
+
+    return count
+
+
+def walk_scan(path: str) -> Directory:
+    """ Baseline builder that walks the tree with os.walk on one thread.
+    """
+    directories = {path: Directory(os.path.basename(path))}
+    for dirpath, dirnames, filenames in os.walk(path):
+        directory = directories[dirpath]
+        for name in sorted(dirnames):
+            subdirectory = Directory(name)
+            directory.add(subdirectory)
+            directories[os.path.join(dirpath, name)] = subdirectory
+        for name in sorted(filenames):
+            size = os.lstat(os.path.join(dirpath, name)).st_size
+            directory.add(File(name, size))
+
+    return directories[path]
+
+
+def measure(build, *args) -> tuple[float, int]:
+    start = time.perf_counter()
+    root = build(*args)
+    return time.perf_counter() - start, root.get_size()
+
+
+if __name__ == "__main__":
+    width = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    with tempfile.TemporaryDirectory() as tmp:
+        count = make_fixture(tmp, width, 3, 20)
+        print(f"{count} files")
+
+        elapsed, size = measure(walk_scan, tmp)
+        print(f"{'os.walk':>12}: {elapsed:.3f}s (size {size})")
+        for workers in (1, 2, 4, 8, 16):
+            elapsed, size = measure(scan, tmp, workers)
+            print(f"{f'scan({workers})':>12}: {elapsed:.3f}s (size {size})")
@@ -0,0 +1,59 @@
+""" Benchmark: cached subtree sizes of composite.Directory
+
+print_list() を実行し、毎回サブツリーを走査してサイズを求める従来の実装と、
+add/remove/resize で集計済みのサイズを保持する現在の実装とを比較する
+"""
+import contextlib
+import io
+import sys
+import time
+
+from design_pattern.composite import Directory, Entry, File
+
+
+class WalkingDirectory(Directory):
+    """ get_size() that re-walks the whole subtree like the original code.
+    """
+
+    def get_size(self) -> int:
+        size = 0
+        for d in self.directory:
+            size += d.get_size()
+
+        return size
+
+
+def make_tree(directory_cls: type, depth: int, files: int) -> Entry:
+    """ Make a chain of nested directories, each holding some files.
+    """
+    root = directory_cls("root")
+    current = root
+    for i in range(depth):
+        for j in range(files):
+            current.add(File(f"f{i}_{j}.txt", j + 1))
+        child = directory_cls(f"d{i}")
+        current.add(child)
+        current = child
+
+    return root
+
+
+def measure(directory_cls: type, depth: int, files: int) -> float:
+    root = make_tree(directory_cls, depth, files)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        root.print_list()
+
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    files = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    print(f"{'depth':>5} {'walking[s]':>12} {'cached[s]':>12} {'speedup':>8}")
+    for depth in (100, 200, 400, 800):
+        walking = measure(WalkingDirectory, depth, files)
+        cached = measure(Directory, depth, files)
+        print(
+            f"{depth:>5} {walking:>12.4f} {cached:>12.4f} "
+            f"{walking / cached:>7.1f}x"
+        )
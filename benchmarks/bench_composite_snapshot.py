@@ -0,0 +1,58 @@
+""" Benchmark: startup time of snapshot load()
+
+保存済みのツリーを開いてルートのサイズを得るまでの時間を、ツリーを組み立て直す
+場合や pickle から復元する場合と比較する
+"""
+import os
+import pickle
+import sys
+import tempfile
+import time
+
+from design_pattern.composite import Directory, File
+from design_pattern.composite_snapshot import load, save
+
+
+def make_tree(directories: int, files: int) -> Directory:
+    root = Directory("root")
+    for i in range(directories):
+        d = Directory(f"dir{i}")
+        root.add(d)
+        for j in range(files):
+            d.add(File(f"file{j}.txt", j))
+
+    return root
+
+
+def measure(func, *args) -> float:
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def open_snapshot(filename: str) -> int:
+    return load(filename).get_size()
+
+
+def open_pickle(filename: str) -> int:
+    with open(filename, "rb") as f:
+        return pickle.load(f).get_size()
+
+
+if __name__ == "__main__":
+    directories = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshot_file = os.path.join(tmp, "tree.snapshot")
+        pickle_file = os.path.join(tmp, "tree.pickle")
+
+        rebuild = measure(make_tree, directories, 100)
+        root = make_tree(directories, 100)
+        save(root, snapshot_file)
+        with open(pickle_file, "wb") as f:
+            pickle.dump(root, f)
+
+        print(f"{directories * 101 + 1} entries, "
+              f"snapshot {os.path.getsize(snapshot_file) / 2**20:.1f}MB")
+        print(f"rebuild      : {rebuild:.3f}s")
+        print(f"pickle.load  : {measure(open_pickle, pickle_file):.3f}s")
+        print(f"snapshot load: {measure(open_snapshot, snapshot_file):.6f}s")
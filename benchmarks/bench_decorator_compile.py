@@ -0,0 +1,72 @@
+""" Benchmark: nested decorator rows vs compiled layout
+
+枠を深く重ねた Display を、行ごとに内側へ問い合わせる get_row_text() で描画
+した場合と、compile() で平坦化したレイアウトから描画した場合とで比較する
+"""
+import sys
+import time
+
+from design_pattern.decorator import (
+    Display, FullBoader, MultiStringDisplay, SideBoader, UpDownBoader
+)
+
+
+def make_display(depth: int, rows: int) -> Display:
+    ms = MultiStringDisplay()
+    for i in range(rows):
+        ms.add(f"line {i}")
+
+    display: Display = ms
+    for i in range(depth):
+        if i % 3 == 0:
+            display = SideBoader(display, "#")
+        elif i % 3 == 1:
+            display = FullBoader(display)
+        else:
+            display = UpDownBoader(display, "=")
+    return display
+
+
+def render_rows(display: Display) -> str:
+    return "\n".join(
+        display.get_row_text(i) for i in range(display.get_rows())
+    )
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    sys.setrecursionlimit(10000)
+    for depth in (3, 10, 30, 100):
+        display = make_display(depth, rows)
+
+        start = time.perf_counter()
+        expected = render_rows(display)
+        nested = time.perf_counter() - start
+
+        start = time.perf_counter()
+        compiled = display.compile()
+        compile_time = time.perf_counter() - start
+        start = time.perf_counter()
+        text = compiled.render()
+        render = time.perf_counter() - start
+
+        assert text == expected
+        print(f"depth {depth:>4}: nested {nested * 1e3:9.2f}ms, "
+              f"compile {compile_time * 1e3:7.3f}ms, "
+              f"render {render * 1e3:7.3f}ms")
+
+    # 深い入れ子では行ごとの描画は遅すぎるので、compile() の伸び方だけを見る
+    for depth in (1000, 2000, 4000):
+        display = make_display(depth, rows)
+
+        start = time.perf_counter()
+        compiled = display.compile()
+        compile_time = time.perf_counter() - start
+        start = time.perf_counter()
+        text = compiled.render()
+        render = time.perf_counter() - start
+
+        assert text == render_rows(compiled)
+        print(f"depth {depth:>4}: nested {'-':>9}  , "
+              f"compile {compile_time * 1e3:7.3f}ms, "
+              f"render {render * 1e3:7.3f}ms")
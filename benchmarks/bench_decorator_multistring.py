@@ -0,0 +1,53 @@
+""" Benchmark: MultiStringDisplay on many lines
+
+行ごとに全行の最大幅を求め直していた以前の実装と、幅を逐次更新する現在の
+実装とを比較する。また大きなファイルの一部だけを表示する時間を計測する
+"""
+import contextlib
+import os
+import sys
+import tempfile
+import time
+
+from design_pattern.decorator import MultiStringDisplay, SideBoader
+
+
+class ScanningMultiStringDisplay(MultiStringDisplay):
+    """ get_columns() as it was implemented before incremental tracking.
+    """
+
+    def get_columns(self) -> int:
+        return max([len(string) for string in self.strings])
+
+
+def show_all(display, *window) -> float:
+    with open(os.devnull, "w") as fp, contextlib.redirect_stdout(fp):
+        start = time.perf_counter()
+        display.show(*window)
+        return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    strings = [f"{i:>8} " + "x" * (i % 70) for i in range(lines)]
+
+    for cls in (ScanningMultiStringDisplay, MultiStringDisplay):
+        ms = cls()
+        for string in strings:
+            ms.add(string)
+        elapsed = show_all(SideBoader(ms, "|"))
+        print(f"{cls.__name__:>27}: {elapsed * 1e3:10.2f}ms ({lines} lines)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "log.txt")
+        with open(path, "w") as fp:
+            for i in range(lines * 40):
+                fp.write(f"{i:>8} " + "x" * (i % 70) + "\n")
+
+        start = time.perf_counter()
+        ms = MultiStringDisplay.from_file(path)
+        index = time.perf_counter() - start
+        elapsed = show_all(SideBoader(ms, "|"), lines * 20, lines * 20 + 100)
+        ms.close()
+        print(f"{'from_file':>27}: index {index * 1e3:8.2f}ms, "
+              f"show 100 rows {elapsed * 1e3:6.2f}ms ({lines * 40} lines)")
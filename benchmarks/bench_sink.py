@@ -0,0 +1,79 @@
+""" Benchmark: per-line print() vs sinks
+
+行ごとに print() していた以前の出力と、まとめて書き込む StdoutSink、
+メモリに貯める BufferSink、出力を捨てる NullSink とを比較する
+出力先は os.devnull と、行バッファリングの効いたパイプの 2 種類
+"""
+import contextlib
+import io
+import os
+import sys
+import threading
+import time
+
+from design_pattern.composite import Directory, File
+from design_pattern.decorator import Display, MultiStringDisplay, SideBoader
+from design_pattern.sink import BufferSink, NullSink, StdoutSink
+
+
+def print_show(display: Display) -> None:
+    """ Display.show() as it was implemented before sinks.
+    """
+    for i in range(display.get_rows()):
+        print(display.get_row_text(i))
+
+
+def print_list(entry, prefix: str = "") -> None:
+    """ print_list() writing every line with print().
+    """
+    for line in entry.iter_list(prefix):
+        print(line)
+
+
+def make_tree(directories: int, files: int) -> Directory:
+    root = Directory("root")
+    for i in range(directories):
+        d = Directory(f"dir{i}")
+        root.add(d)
+        for j in range(files):
+            d.add(File(f"file{j}.txt", j))
+    return root
+
+
+def measure(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    ms = MultiStringDisplay(f"line {i}" for i in range(lines))
+    display = SideBoader(ms, "|")
+    root = make_tree(lines // 100, 99)
+
+    # 行バッファリングされたパイプは、別スレッドで読み捨てる
+    r, w = os.pipe()
+    reader = threading.Thread(
+        target=lambda: all(iter(lambda: os.read(r, 1 << 20), b""))
+    )
+    reader.start()
+    pipe = io.TextIOWrapper(os.fdopen(w, "wb"), line_buffering=True)
+    with open(os.devnull, "w") as devnull:
+        for target, fp in (("devnull", devnull), ("line-buffered", pipe)):
+            cases = [
+                ("show: print", lambda: print_show(display)),
+                ("show: StdoutSink", lambda: display.show()),
+                ("show: BufferSink", lambda: display.show(sink=BufferSink())),
+                ("show: NullSink", lambda: display.show(sink=NullSink())),
+                ("list: print", lambda: print_list(root)),
+                ("list: StdoutSink",
+                 lambda: root.print_list(sink=StdoutSink())),
+                ("list: NullSink", lambda: root.print_list(sink=NullSink())),
+            ]
+            for label, func in cases:
+                with contextlib.redirect_stdout(fp):
+                    elapsed = measure(func)
+                print(f"{target:>14} {label:>18}: {elapsed * 1e3:8.2f}ms")
+    pipe.close()
+    reader.join()
@@ -0,0 +1,62 @@
+""" Benchmark: per-character east_asian_width loop vs text_width
+
+文字ごとに east_asian_width を呼んでいた以前の幅の計算と、text_width モジュール
+とを、英語だけ・日本語だけ・混在した文字列の集まりで比較する
+"""
+import random
+import sys
+import time
+from unicodedata import east_asian_width
+
+from design_pattern.text_width import _width, width
+
+ENGLISH = "The quick brown fox jumps over the lazy dog"
+JAPANESE = "いろはにほへとちりぬるをわかよたれそつねならむ漢字カタカナ"
+
+
+def loop_width(string: str) -> int:
+    """ Width as computed before the text_width module.
+    """
+    length = 0
+    for c in string:
+        if east_asian_width(c) in "FWA":
+            length += 2
+        else:
+            length += 1
+    return length
+
+
+def make_corpus(lines: int, japanese: float, unique: int) -> list[str]:
+    rng = random.Random(0)
+    pool = []
+    for _ in range(unique):
+        chars = []
+        for _ in range(rng.randint(10, 60)):
+            alphabet = JAPANESE if rng.random() < japanese else ENGLISH
+            chars.append(rng.choice(alphabet))
+        pool.append("".join(chars))
+    return [rng.choice(pool) for _ in range(lines)]
+
+
+def measure(func, corpus: list[str]) -> float:
+    start = time.perf_counter()
+    for string in corpus:
+        func(string)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    for label, japanese, unique in (
+        ("english", 0.0, 1000),
+        ("japanese", 1.0, 1000),
+        ("mixed", 0.3, 1000),
+        ("mixed, all unique", 0.3, lines),
+    ):
+        corpus = make_corpus(lines, japanese, unique)
+        assert [loop_width(s) for s in corpus] == [width(s) for s in corpus]
+        _width.cache_clear()
+        loop = measure(loop_width, corpus)
+        cached = measure(width, corpus)
+        print(f"{label:>18}: loop {loop * 1e3:8.2f}ms, "
+              f"text_width {cached * 1e3:8.2f}ms")
@@ -0,0 +1,66 @@
+""" Benchmark: AsyncVisitor vs synchronous visitor for I/O-bound handlers
+
+ファイルごとに I/O 待ちがある処理を、同期の Visitor で順に実行した場合と
+AsyncVisitor で同時実行数を変えて実行した場合とで比較する
+"""
+import asyncio
+import sys
+import time
+
+from design_pattern.visitor import Directory, File, Visitor
+from design_pattern.visitor_async import AsyncVisitor, traverse_async
+
+LATENCY = 0.002
+
+
+class BlockingDigestVisitor(Visitor):
+    def __init__(self):
+        self.digests = []
+
+    def visit_file(self, entry: File) -> None:
+        time.sleep(LATENCY)
+        self.digests.append(hash(entry.get_name()))
+
+
+class AsyncDigestVisitor(AsyncVisitor):
+    def __init__(self):
+        self.digests = []
+
+    async def visit_file(self, entry: File) -> int:
+        await asyncio.sleep(LATENCY)
+        return hash(entry.get_name())
+
+    def collect(self, entry, result) -> None:
+        if result is not None:
+            self.digests.append(result)
+
+
+def make_tree(directories: int, files: int) -> Directory:
+    root = Directory("root")
+    for i in range(directories):
+        d = Directory(f"dir{i}")
+        root.add(d)
+        for j in range(files):
+            d.add(File(f"file{i}-{j}.txt", j))
+
+    return root
+
+
+if __name__ == "__main__":
+    directories = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    root = make_tree(directories, 50)
+    print(f"{directories * 50} files, {LATENCY * 1e3:.0f}ms per file")
+
+    visitor = BlockingDigestVisitor()
+    start = time.perf_counter()
+    root.accept(visitor)
+    expected = visitor.digests
+    print(f"{'sync':>16}: {time.perf_counter() - start:8.3f}s")
+
+    for concurrency in (1, 16, 64, 256):
+        visitor = AsyncDigestVisitor()
+        start = time.perf_counter()
+        asyncio.run(traverse_async(root, visitor, concurrency))
+        elapsed = time.perf_counter() - start
+        assert visitor.digests == expected
+        print(f"{f'async x{concurrency}':>16}: {elapsed:8.3f}s")
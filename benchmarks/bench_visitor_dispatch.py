@@ -0,0 +1,97 @@
+""" Benchmark: traverse() vs recursive accept()/visit()
+
+accept() と isinstance による分岐で再帰的に辿っていた従来の Visitor と、
+明示的なスタックと型ごとのハンドラ表を使う traverse() とを比較する
+"""
+import contextlib
+import os
+import sys
+import time
+
+from design_pattern.visitor import (
+    Directory, File, FileFindVisitor, ListVisitor, SizeVisitor
+)
+
+
+class RecursiveSizeVisitor(object):
+    def __init__(self):
+        self.size = 0
+
+    def visit(self, entry) -> None:
+        if isinstance(entry, File):
+            self.size += entry.get_size()
+
+        if isinstance(entry, Directory):
+            for d in entry.directory:
+                self.visit(d)
+
+
+class RecursiveFileFindVisitor(object):
+    def __init__(self, suffix: str):
+        self.suffix = suffix
+        self.found_file = []
+
+    def visit(self, entry) -> None:
+        if isinstance(entry, File) and entry.get_name().endswith(self.suffix):
+            self.found_file.append(entry)
+
+        if isinstance(entry, Directory):
+            for e in entry.directory:
+                self.visit(e)
+
+
+class RecursiveListVisitor(object):
+    def __init__(self, current_dir: str = ""):
+        self.current_dir = current_dir
+
+    def visit(self, entry) -> None:
+        print(f"{self.current_dir}/{entry}")
+
+        if isinstance(entry, Directory):
+            backup = self.current_dir
+            self.current_dir = f"{self.current_dir}//{entry.get_name()}"
+            for e in entry.directory:
+                self.visit(e)
+
+            self.current_dir = backup
+
+
+def make_tree(directories: int, files: int) -> Directory:
+    root = Directory("root")
+    for i in range(directories):
+        d = Directory(f"dir{i}")
+        root.add(d)
+        for j in range(files):
+            d.add(File(f"file{j}.{'html' if j % 10 == 0 else 'txt'}", j))
+
+    return root
+
+
+def measure(visitor, root) -> float:
+    start = time.perf_counter()
+    visitor.visit(root)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    directories = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    root = make_tree(directories, 100)
+    print(f"{directories * 101 + 1} entries")
+
+    cases = [
+        ("SizeVisitor", RecursiveSizeVisitor(), SizeVisitor()),
+        ("FileFindVisitor", RecursiveFileFindVisitor(".html"),
+         FileFindVisitor(".html")),
+    ]
+    for label, recursive, iterative in cases:
+        before = measure(recursive, root)
+        after = measure(iterative, root)
+        print(f"{label:>16}: recursive {before:.3f}s, "
+              f"traverse {after:.3f}s ({before / after:.1f}x)")
+
+    small = make_tree(directories // 10, 100)
+    with open(os.devnull, "w") as fp, contextlib.redirect_stdout(fp):
+        before = measure(RecursiveListVisitor(), small)
+        after = measure(ListVisitor(), small)
+    print(f"{'ListVisitor':>16}: recursive {before:.3f}s, "
+          f"traverse {after:.3f}s ({before / after:.1f}x)")
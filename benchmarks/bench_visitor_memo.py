@@ -0,0 +1,62 @@
+""" Benchmark: memoized Directory.get_size()
+
+ListVisitor は各行の出力で Directory.get_size() を呼ぶため、毎回サブツリーを
+辿る実装ではツリーが深いほど遅くなる。キャッシュを使わない場合と比べる
+"""
+import contextlib
+import os
+import time
+
+from design_pattern.visitor import (
+    Directory, File, ListVisitor, SizeVisitor
+)
+
+
+class WalkingDirectory(Directory):
+    """ get_size() that walks the whole subtree like the original code.
+    """
+
+    def get_size(self) -> int:
+        sv = SizeVisitor()
+        self.accept(sv)
+        return sv.get_size()
+
+
+def make_tree(directory_cls: type, depth: int, files: int) -> Directory:
+    root = directory_cls("root")
+    current = root
+    for i in range(depth):
+        for j in range(files):
+            current.add(File(f"f{i}_{j}.txt", j + 1))
+        child = directory_cls(f"d{i}")
+        current.add(child)
+        current = child
+
+    return root
+
+
+def measure(root: Directory) -> float:
+    start = time.perf_counter()
+    with open(os.devnull, "w") as fp, contextlib.redirect_stdout(fp):
+        root.accept(ListVisitor())
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    print(f"{'depth':>5} {'walking[s]':>11} {'memo[s]':>8} "
+          f"{'after add[ms]':>14}")
+    for depth in (100, 200, 400, 800):
+        walking = measure(make_tree(WalkingDirectory, depth, 10))
+        root = make_tree(Directory, depth, 10)
+        memo = measure(root)
+
+        leaf = root
+        while len(leaf.directory) > 10:
+            leaf = leaf.directory[-1]
+        leaf.add(File("new.txt", 1))
+        start = time.perf_counter()
+        root.get_size()
+        update = time.perf_counter() - start
+
+        print(f"{depth:>5} {walking:>11.3f} {memo:>8.3f} "
+              f"{update * 1e3:>14.3f}")
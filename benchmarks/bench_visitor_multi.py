@@ -0,0 +1,56 @@
+""" Benchmark: fused traversal vs running visitors one by one
+
+SizeVisitor, FileFindVisitor, ListVisitor を順に実行してツリーを 3 回辿る場合と、
+traverse() で 1 回の走査にまとめた場合とを比較する
+"""
+import contextlib
+import os
+import sys
+import time
+
+from design_pattern.visitor import (
+    Directory, File, FileFindVisitor, ListVisitor, SizeVisitor, traverse
+)
+
+
+def make_tree(directories: int, files: int) -> Directory:
+    root = Directory("root")
+    for i in range(directories):
+        d = Directory(f"dir{i}")
+        root.add(d)
+        for j in range(files):
+            d.add(File(f"file{j}.{'html' if j % 10 == 0 else 'txt'}", j))
+
+    return root
+
+
+def make_visitors(with_list: bool) -> list:
+    visitors = [SizeVisitor(), FileFindVisitor(".html")]
+    if with_list:
+        visitors.append(ListVisitor())
+    return visitors
+
+
+def measure(root: Directory, with_list: bool) -> tuple[float, float]:
+    with open(os.devnull, "w") as fp, contextlib.redirect_stdout(fp):
+        start = time.perf_counter()
+        for v in make_visitors(with_list):
+            root.accept(v)
+        sequential = time.perf_counter() - start
+
+        start = time.perf_counter()
+        traverse(root, *make_visitors(with_list))
+        fused = time.perf_counter() - start
+
+    return sequential, fused
+
+
+if __name__ == "__main__":
+    directories = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    root = make_tree(directories, 100)
+    print(f"{directories * 101 + 1} entries")
+    for label, with_list in (("Size + FileFind", False),
+                             ("Size + FileFind + List", True)):
+        sequential, fused = measure(root, with_list)
+        print(f"{label:>22}: sequential {sequential:.3f}s, "
+              f"fused {fused:.3f}s ({sequential / fused:.2f}x)")
@@ -0,0 +1,42 @@
+""" Benchmark: parallel_visit() with different worker counts
+
+SizeVisitor と FileFindVisitor をプロセスプールで実行し、ワーカー数ごとの
+処理時間を直列の実行と比較する
+"""
+import sys
+import time
+
+from design_pattern.visitor import (
+    Directory, File, FileFindVisitor, SizeVisitor
+)
+from design_pattern.visitor_parallel import parallel_visit
+
+
+def make_tree(directories: int, files: int) -> Directory:
+    root = Directory("root")
+    for i in range(directories):
+        d = Directory(f"dir{i}")
+        root.add(d)
+        for j in range(files):
+            d.add(File(f"file{j}.{'html' if j % 10 == 0 else 'txt'}", j))
+
+    return root
+
+
+if __name__ == "__main__":
+    directories = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    root = make_tree(directories, 100)
+    print(f"{directories * 101 + 1} entries")
+
+    for visitor_cls, args in ((SizeVisitor, ()),
+                              (FileFindVisitor, (".html",))):
+        start = time.perf_counter()
+        root.accept(visitor_cls(*args))
+        serial = time.perf_counter() - start
+        print(f"{visitor_cls.__name__}: serial {serial:.3f}s")
+
+        for workers in (1, 2, 4, 8):
+            start = time.perf_counter()
+            parallel_visit(root, visitor_cls, *args, workers=workers)
+            elapsed = time.perf_counter() - start
+            print(f"  workers={workers}: {elapsed:.3f}s")
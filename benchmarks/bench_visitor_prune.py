@@ -0,0 +1,66 @@
+""" Benchmark: early exit and pruning of visitors
+
+最初の 1 件だけを探す FileFindVisitor(limit=1) と、対象外のサブツリーを
+prune() で読み飛ばす Visitor とを、全体を辿る場合と比較する
+"""
+import sys
+import time
+
+from design_pattern.visitor import (
+    Directory, File, FileFindVisitor, Visitor
+)
+
+
+class UnderFileFindVisitor(FileFindVisitor):
+    """ FileFindVisitor limited to the top-level directory `under`.
+    """
+
+    def __init__(self, suffix: str, under: str, limit=None):
+        super().__init__(suffix, limit)
+        self.under = under
+        self.depth = 0
+
+    def prune(self, entry: Directory) -> bool:
+        return self.depth == 1 and entry.get_name() != self.under
+
+    def visit_directory(self, entry: Directory) -> None:
+        self.depth += 1
+
+    def leave_directory(self, entry: Directory) -> None:
+        self.depth -= 1
+
+
+def make_tree(directories: int, files: int) -> Directory:
+    root = Directory("root")
+    for i in range(directories):
+        d = Directory(f"dir{i}")
+        root.add(d)
+        for j in range(files):
+            d.add(File(f"file{j}.{'html' if j % 10 == 0 else 'txt'}", j))
+
+    return root
+
+
+def measure(root: Directory, visitor: Visitor) -> float:
+    start = time.perf_counter()
+    root.accept(visitor)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    directories = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    root = make_tree(directories, 100)
+    target = f"dir{directories // 2}"
+    print(f"{directories * 101 + 1} entries")
+
+    cases = [
+        ("all *.html", FileFindVisitor(".html")),
+        ("first *.html", FileFindVisitor(".html", limit=1)),
+        (f"*.html under {target}", UnderFileFindVisitor(".html", target)),
+        (f"first *.html under {target}",
+         UnderFileFindVisitor(".html", target, limit=1)),
+    ]
+    for label, visitor in cases:
+        elapsed = measure(root, visitor)
+        print(f"{label:>28}: {elapsed * 1e3:9.3f}ms "
+              f"({len(visitor.get_found_file())} found)")
@@ -0,0 +1,74 @@
+""" Benchmark: compiled queries vs hand-written visitors
+
+Query をコンパイルした Visitor と FileFindVisitor などの手書きの Visitor とで、
+同じ条件の検索にかかる時間を比較する
+"""
+import sys
+import time
+
+from design_pattern.visitor import (
+    Directory, File, FileFindVisitor, SuffixIndex, Visitor
+)
+from design_pattern.visitor_query import Query
+
+
+class LargeHtmlVisitor(Visitor):
+    """ Hand-written equivalent of 'name ~ "*.html" and size > 45'.
+    """
+
+    def __init__(self):
+        self.found_file = []
+
+    def visit_file(self, entry: File) -> None:
+        if entry.get_name().endswith(".html") and entry.get_size() > 45:
+            self.found_file.append(entry)
+
+
+def make_tree(directories: int, files: int) -> Directory:
+    root = Directory("root")
+    for i in range(directories):
+        d = Directory(f"dir{i}")
+        root.add(d)
+        for j in range(files):
+            size = j if i % 100 == 0 else j % 50
+            d.add(File(f"file{j}.{'html' if j % 10 == 0 else 'txt'}", size))
+
+    return root
+
+
+def measure(func, repeat: int = 5) -> tuple[float, int]:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        found = func()
+    return (time.perf_counter() - start) / repeat, len(found)
+
+
+def run_visitor(root: Directory, visitor: Visitor) -> list:
+    root.accept(visitor)
+    return visitor.found_file
+
+
+if __name__ == "__main__":
+    directories = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    root = make_tree(directories, 100)
+    root.get_size()
+    print(f"{directories * 101 + 1} entries")
+
+    suffix_query = Query('name ~ "*.html"')
+    size_query = Query('name ~ "*.html" and size > 45')
+    cases = [
+        ("FileFindVisitor(.html)",
+         lambda: run_visitor(root, FileFindVisitor(".html"))),
+        ("query *.html", lambda: suffix_query.run(root)),
+        ("LargeHtmlVisitor", lambda: run_visitor(root, LargeHtmlVisitor())),
+        ("query *.html and size > 45", lambda: size_query.run(root)),
+    ]
+    for label, func in cases:
+        elapsed, found = measure(func)
+        print(f"{label:>28}: {elapsed * 1e3:8.2f}ms ({found} found)")
+
+    SuffixIndex(root)
+    for label, func in cases:
+        elapsed, found = measure(func)
+        print(f"{label + ' [index]':>36}: {elapsed * 1e3:8.2f}ms "
+              f"({found} found)")
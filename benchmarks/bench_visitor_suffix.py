@@ -0,0 +1,46 @@
+""" Benchmark: FileFindVisitor with and without SuffixIndex
+
+全ファイルの名前を調べる FileFindVisitor と、接尾辞索引を使う場合とで
+1 回の検索にかかる時間をツリーの大きさごとに比較する
+"""
+import time
+
+from design_pattern.visitor import (
+    Directory, File, FileFindVisitor, SuffixIndex
+)
+
+EXTENSIONS = ["txt", "md", "py", "png", "json", "csv", "yaml", "html"]
+
+
+def make_tree(directories: int, files: int) -> Directory:
+    root = Directory("root")
+    for i in range(directories):
+        d = Directory(f"dir{i}")
+        root.add(d)
+        for j in range(files):
+            ext = EXTENSIONS[j % len(EXTENSIONS)] if j else "pdf"
+            d.add(File(f"file{j}.{ext}", j))
+
+    return root
+
+
+def measure(root: Directory, suffix: str, queries: int) -> float:
+    start = time.perf_counter()
+    for _ in range(queries):
+        root.accept(FileFindVisitor(suffix))
+    return (time.perf_counter() - start) / queries
+
+
+if __name__ == "__main__":
+    print(f"{'entries':>8} {'walk[ms]':>9} {'index[ms]':>10} {'build[s]':>9}")
+    for directories in (100, 1000, 10000):
+        root = make_tree(directories, 100)
+        walk = measure(root, ".pdf", 3)
+
+        start = time.perf_counter()
+        SuffixIndex(root)
+        build = time.perf_counter() - start
+        indexed = measure(root, ".pdf", 100)
+
+        print(f"{directories * 101:>8} {walk * 1e3:>9.2f} "
+              f"{indexed * 1e3:>10.3f} {build:>9.3f}")
@@ -5,21 +5,117 @@
 """
 from __future__ import annotations
 from abc import ABC, abstractmethod
+from typing import Callable, Iterable, Iterator, Optional
 
 
-class Item(ABC):
-    def __init__(self, caption: str):
-        self.caption = caption
+class Fragment(ABC):
+    """ HTML fragment that caches make_html() until it is invalidated.
+
+    containers are the fragments that include this one. They are
+    invalidated together, so a fragment shared by many containers is
+    rendered once until it changes.
+    """
+
+    def __init__(self):
+        self._html: Optional[str] = None
+        self.containers: list[Fragment] = []
+
+    def get_html(self) -> str:
+        if self._html is None:
+            self._html = self.make_html()
+        return self._html
+
+    def iter_html(self) -> Iterator[str]:
+        """ Yield the HTML in pieces.
+
+        Cached HTML is reused, but nothing new is cached, so memory does
+        not grow with the size of the fragment.
+        """
+        if self._html is not None:
+            yield self._html
+        else:
+            yield from self.iter_parts(Fragment.iter_html)
 
-    @abstractmethod
     def make_html(self) -> str:
-        pass
+        return "".join(self.iter_parts(_cached_html))
+
+    def invalidate(self) -> None:
+        """ Drop the cached HTML of this fragment and its containers.
+        """
+        stack: list[Fragment] = [self]
+        while stack:
+            fragment = stack.pop()
+            # 未生成のものを含む側も未生成のはずなので、そこで止める
+            if fragment._html is None and fragment is not self:
+                continue
+            fragment._html = None
+            stack.extend(fragment.containers)
+
+    def iter_parts(
+        self, render: Callable[[Fragment], Iterable[str]]
+    ) -> Iterator[str]:
+        """ Yield the pieces of the HTML, rendering contained fragments
+        with render.
+
+        Subclasses implement this or make_html(). By default the whole of
+        make_html() is yielded as one piece.
+        """
+        if type(self).make_html is Fragment.make_html:
+            raise NotImplementedError(
+                f"{type(self).__name__} must implement iter_parts() "
+                "or make_html()"
+            )
+        yield self.make_html()
+
+
+def _cached_html(fragment: Fragment) -> tuple[str]:
+    return (fragment.get_html(),)
+
+
+def iter_chunks(parts: Iterable[str], chunk_size: int) -> Iterator[str]:
+    """ Join parts into chunks of about chunk_size characters.
+    """
+    buf: list[str] = []
+    length = 0
+    for part in parts:
+        buf.append(part)
+        length += len(part)
+        if length >= chunk_size:
+            yield "".join(buf)
+            buf = []
+            length = 0
+    if buf:
+        yield "".join(buf)
+
+
+class Item(Fragment):
+    def __init__(self, caption: str):
+        super().__init__()
+        self._caption = caption
+
+    @property
+    def caption(self) -> str:
+        return self._caption
+
+    @caption.setter
+    def caption(self, caption: str) -> None:
+        self._caption = caption
+        self.invalidate()
 
 
 class Link(Item):
     def __init__(self, caption: str, url: str):
         super().__init__(caption)
-        self.url = url
+        self._url = url
+
+    @property
+    def url(self) -> str:
+        return self._url
+
+    @url.setter
+    def url(self, url: str) -> None:
+        self._url = url
+        self.invalidate()
 
 
 class Tray(Item):
@@ -29,31 +125,54 @@ class Tray(Item):
 
     def add(self, item: Item):
         self.tray.append(item)
+        item.containers.append(self)
+        self.invalidate()
 
 
-class Page(ABC):
+class Page(Fragment):
     def __init__(self, title: str, author: str):
-        self.title = title
-        self.author = author
+        super().__init__()
+        self._title = title
+        self._author = author
         self.content: list = []
 
+    @property
+    def title(self) -> str:
+        return self._title
+
+    @title.setter
+    def title(self, title: str) -> None:
+        self._title = title
+        self.invalidate()
+
+    @property
+    def author(self) -> str:
+        return self._author
+
+    @author.setter
+    def author(self, author: str) -> None:
+        self._author = author
+        self.invalidate()
+
     def add(self, item: Item) -> None:
         self.content.append(item)
+        item.containers.append(self)
+        self.invalidate()
 
-    def output(self) -> None:
+    def output(self, chunk_size: int = 65536) -> None:
+        """ Write the page to "<title>.html" in chunks of about chunk_size
+        characters.
+        """
         try:
             filename = f"{self.title}.html"
             with open(filename, mode="w", encoding="utf-8") as f:
-                f.write(self.make_html())
+                for chunk in iter_chunks(self.iter_html(), chunk_size):
+                    f.write(chunk)
 
             print(f"Has created {filename}")
         except Exception as e:
             raise e
 
-    @abstractmethod
-    def make_html(self) -> str:
-        pass
-
 
 class Factory(ABC):
     @abstractmethod
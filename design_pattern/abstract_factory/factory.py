@@ -1,7 +1,9 @@
 """ Implemented Abstract Factory
 抽象クラスの実装、抽象クラスにのみ依存する
 """
-from abstract_factory import Factory, Item, Link, Page, Tray
+from typing import Callable, Iterable, Iterator
+
+from abstract_factory import Factory, Fragment, Item, Link, Page, Tray
 
 
 class ListLink(Link):
@@ -16,39 +18,36 @@ class ListTray(Tray):
     def __init__(self, caption: str):
         super().__init__(caption)
 
-    def make_html(self) -> str:
-        buf: list[str] = []
-        buf.append("<li>\n")
-        buf.append(f"{self.caption}\n")
-        buf.append("<ul>\n")
+    def iter_parts(
+        self, render: Callable[[Fragment], Iterable[str]]
+    ) -> Iterator[str]:
+        yield "<li>\n"
+        yield f"{self.caption}\n"
+        yield "<ul>\n"
         for t in self.tray:
-            buf.append(t.make_html())
-
-        buf.append("</ul>\n")
-        buf.append("</li>\n")
+            yield from render(t)
 
-        return "".join(buf)
+        yield "</ul>\n"
+        yield "</li>\n"
 
 
 class ListPage(Page):
     def __init__(self, title: str, author: str):
         super().__init__(title, author)
 
-    def make_html(self) -> str:
-        buf = []
-
-        buf.append(f"<html><head><title>{self.title}</title></head>\n")
-        buf.append("<body>\n")
-        buf.append(f"<h1>{self.title}</h1>\n")
-        buf.append("<ul>\n")
+    def iter_parts(
+        self, render: Callable[[Fragment], Iterable[str]]
+    ) -> Iterator[str]:
+        yield f"<html><head><title>{self.title}</title></head>\n"
+        yield "<body>\n"
+        yield f"<h1>{self.title}</h1>\n"
+        yield "<ul>\n"
         for c in self.content:
-            buf.append(c.make_html())
-
-        buf.append("</ul>\n")
-        buf.append(f"<hr><address>{self.author}</address>")
-        buf.append("</body></html>\n")
+            yield from render(c)
 
-        return "".join(buf)
+        yield "</ul>\n"
+        yield f"<hr><address>{self.author}</address>"
+        yield "</body></html>\n"
 
 
 class ListFactory(Factory):
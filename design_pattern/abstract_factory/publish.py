@@ -0,0 +1,200 @@
+""" Abstract Factory Publisher
+多数のページをスレッドプールで並行に書き出す
+各ページは一時ファイルに書いてから置き換えるので、途中の状態のファイルは
+見えない。各ページの内容のハッシュを出力先の目録ファイルに記録しておき、
+前回と同じページはディスクに触れずに読み飛ばす
+"""
+from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import json
+import os
+import shutil
+import time
+from typing import Iterable, Iterator, Optional
+import uuid
+
+from abstract_factory import _cached_html, iter_chunks, Page
+
+# 出力先に置く目録。ファイル名ごとに Record を持つ
+MANIFEST = ".publish-manifest.json"
+
+# [ハッシュ, ファイルのサイズ, 更新時刻]。JSON から読むのでリストにする
+Record = list
+
+
+class PublishReport(object):
+    """ Aggregate result of publish_all().
+    """
+
+    def __init__(self):
+        self.written: list[str] = []
+        self.skipped: list[str] = []
+        self.failed: list[tuple[str, Exception]] = []
+        self.elapsed = 0.0
+
+    def __bool__(self) -> bool:
+        """ True when every page was published.
+        """
+        return not self.failed
+
+    def __str__(self):
+        total = len(self.written) + len(self.skipped) + len(self.failed)
+        lines = [
+            f"Published {total} pages in {self.elapsed:.2f}s: "
+            f"{len(self.written)} written, {len(self.skipped)} unchanged, "
+            f"{len(self.failed)} failed"
+        ]
+        for path, e in self.failed:
+            lines.append(f"  {path}: {e}")
+        return "\n".join(lines)
+
+
+def publish_all(
+    pages: Iterable[Page],
+    out_dir: str,
+    workers: Optional[int] = None,
+    chunk_size: int = 65536,
+) -> PublishReport:
+    """ Write every page to "<out_dir>/<title>.html" with a thread pool.
+
+    Items shared between pages are rendered once through their cache.
+    Every page is hashed in memory first. A page whose hash matches the
+    manifest of out_dir, with a file still of the recorded size and
+    modification time, is skipped without touching its file.
+    """
+    start = time.perf_counter()
+    pages = list(pages)
+    paths = [os.path.join(out_dir, f"{page.title}.html") for page in pages]
+    if len(set(paths)) != len(paths):
+        raise ValueError("pages must have different titles")
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = _load_manifest(out_dir)
+
+    report = PublishReport()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(
+                _publish, page, path,
+                manifest.get(os.path.basename(path)), chunk_size
+            )
+            for page, path in zip(pages, paths)
+        ]
+        for path, future in zip(paths, futures):
+            name = os.path.basename(path)
+            try:
+                written, manifest[name] = future.result()
+            except Exception as e:
+                manifest.pop(name, None)
+                report.failed.append((path, e))
+            else:
+                (report.written if written else report.skipped).append(path)
+
+    if report.written or report.failed:
+        _save_manifest(out_dir, manifest)
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+def _publish(
+    page: Page, path: str, recorded: Optional[Record], chunk_size: int
+) -> tuple[bool, Record]:
+    """ Write page to path atomically unless it matches the record.
+
+    Returns whether the file was written, and the new record.
+    """
+    digest = hashlib.blake2b()
+    for chunk in _iter_page(page, chunk_size):
+        digest.update(chunk.encode("utf-8"))
+    record = [digest.hexdigest(), *_stat(path)]
+    if record == recorded:
+        return False, record
+
+    # 変わったページだけもう一度描画する。アイテムはキャッシュから取る
+    fd, tmp = _create_temp(path)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for chunk in _iter_page(page, chunk_size):
+                f.write(chunk.encode("utf-8"))
+        if record[1] is not None:
+            # 上書きした場合と同じく、既存のファイルの権限を引き継ぐ
+            shutil.copymode(path, tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return True, [record[0], *_stat(path)]
+
+
+def _stat(path: str) -> tuple[Optional[int], Optional[int]]:
+    """ Return the size and modification time of path, or Nones.
+    """
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None, None
+    return st.st_size, st.st_mtime_ns
+
+
+def _load_manifest(out_dir: str) -> dict[str, Record]:
+    try:
+        with open(os.path.join(out_dir, MANIFEST), encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+    return manifest if isinstance(manifest, dict) else {}
+
+
+def _save_manifest(out_dir: str, manifest: dict[str, Record]) -> None:
+    path = os.path.join(out_dir, MANIFEST)
+    fd, tmp = _create_temp(path)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(json.dumps(manifest).encode("utf-8"))
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def _create_temp(path: str) -> tuple[int, str]:
+    """ Create a new file next to path with the permissions open() gives.
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+    while True:
+        tmp = f"{path}.{uuid.uuid4().hex[:8]}.tmp"
+        try:
+            return os.open(tmp, flags, 0o666), tmp
+        except FileExistsError:
+            continue
+
+
+def _iter_page(page: Page, chunk_size: int) -> Iterator[str]:
+    """ Render the page in chunks, taking the items from their cache.
+
+    The page itself is not cached, so memory stays bounded by the items.
+    """
+    return iter_chunks(page.iter_parts(_cached_html), chunk_size)
+
+
+if __name__ == "__main__":
+    import sys
+
+    from factory import ListFactory
+
+    out_dir = sys.argv[1] if len(sys.argv) > 1 else "site"
+    factory = ListFactory()
+    tray = factory.create_tray("Search Engine")
+    tray.add(factory.create_link("Excite", "http://excite.com"))
+    tray.add(factory.create_link("Google", "http://google.com"))
+
+    pages = []
+    for i in range(100):
+        page = factory.create_page(f"page{i}", "shinichiro")
+        page.add(tray)
+        page.add(factory.create_link(f"link{i}", f"http://example.com/{i}"))
+        pages.append(page)
+
+    print(publish_all(pages, out_dir))
+    pages[0].add(factory.create_link("Yahoo!", "http://www.yahoo.com/"))
+    print(publish_all(pages, out_dir))
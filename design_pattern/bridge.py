@@ -6,22 +6,28 @@
 流れを機能側で定義。各工程での処理内容は実装側で定義している。
 """
 from abc import ABC, abstractmethod
-from typing import final
+from typing import final, Optional
+
+from design_pattern.sink import default_sink, Sink, StdoutSink
+
+# open() などを直接呼んだときの出力先
+_stdout = StdoutSink(buffer_size=0)
 
 
 class DisplayImpl(ABC):
     """ Abstract implementer
     """
+
     @abstractmethod
-    def raw_open(self):
+    def raw_open(self, sink: Sink = _stdout):
         pass
 
     @abstractmethod
-    def raw_print(self):
+    def raw_print(self, sink: Sink = _stdout):
         pass
 
     @abstractmethod
-    def raw_close(self):
+    def raw_close(self, sink: Sink = _stdout):
         pass
 
 
@@ -29,17 +35,17 @@ class StringDisplay(DisplayImpl):
     def __init__(self, string: str):
         self.string = string
 
-    def raw_open(self):
-        self.print_line()
+    def raw_open(self, sink: Sink = _stdout):
+        self.print_line(sink)
 
-    def raw_print(self):
-        print(self.string)
+    def raw_print(self, sink: Sink = _stdout):
+        sink.write_line(self.string)
 
-    def raw_close(self):
-        self.print_line()
+    def raw_close(self, sink: Sink = _stdout):
+        self.print_line(sink)
 
-    def print_line(self):
-        print("-" * 10)
+    def print_line(self, sink: Sink = _stdout):
+        sink.write_line("-" * 10)
 
 
 class CharDisplay(DisplayImpl):
@@ -47,15 +53,15 @@ class CharDisplay(DisplayImpl):
         self.char = char[0]
         self.buf: list = []
 
-    def raw_open(self):
+    def raw_open(self, sink: Sink = _stdout):
         self.buf.append("<")
 
-    def raw_print(self):
+    def raw_print(self, sink: Sink = _stdout):
         self.buf.append(self.char)
 
-    def raw_close(self):
+    def raw_close(self, sink: Sink = _stdout):
         self.buf.append(">")
-        print("".join(self.buf))
+        sink.write_line("".join(self.buf))
         self.buf = []
 
 
@@ -66,30 +72,32 @@ class Display(object):
     def __init__(self, impl: DisplayImpl):
         self.impl = impl
 
-    def open(self):
-        self.impl.raw_open()
+    def open(self, sink: Sink = _stdout):
+        self.impl.raw_open(sink)
 
-    def print(self):
-        self.impl.raw_print()
+    def print(self, sink: Sink = _stdout):
+        self.impl.raw_print(sink)
 
-    def close(self):
-        self.impl.raw_close()
+    def close(self, sink: Sink = _stdout):
+        self.impl.raw_close(sink)
 
     @final
-    def display(self):
-        self.open()
-        self.print()
-        self.close()
+    def display(self, sink: Optional[Sink] = None):
+        with default_sink(sink) as sink:
+            self.open(sink)
+            self.print(sink)
+            self.close(sink)
 
 
 class CountDisplay(Display):
-    def multi_display(self, times: int) -> None:
+    def multi_display(self, times: int, sink: Optional[Sink] = None) -> None:
         """ Add different process flow
         """
-        self.open()
-        for i in range(0, times):
-            self.print()
-        self.close()
+        with default_sink(sink) as sink:
+            self.open(sink)
+            for i in range(0, times):
+                self.print(sink)
+            self.close(sink)
 
 
 class IteratorDisplay(CountDisplay):
@@ -97,11 +105,14 @@ class IteratorDisplay(CountDisplay):
         self.steps = steps
         super().__init__(impl)
 
-    def iterate_display(self, times: int) -> None:
+    def iterate_display(
+        self, times: int, sink: Optional[Sink] = None
+    ) -> None:
         count = 0
-        for i in range(0, times):
-            self.multi_display(count)
-            count += self.steps
+        with default_sink(sink) as sink:
+            for i in range(0, times):
+                self.multi_display(count, sink)
+                count += self.steps
 
 
 if __name__ == "__main__":
@@ -7,6 +7,9 @@
 
 from abc import ABC, abstractmethod
 import sys
+from typing import IO, Optional, Union
+
+from design_pattern.sink import FileSink, Sink, StdoutSink
 
 
 class Builder(ABC):
@@ -28,23 +31,32 @@ class Builder(ABC):
 
 
 class Director(object):
-    def __init__(self, builder: Builder):
+    def __init__(
+        self, builder: Builder, title: str = "Greeting",
+        sections: Optional[list[tuple[str, list[str]]]] = None
+    ):
         self.builder = builder
+        self.title = title
+        if sections is None:
+            sections = [
+                ("from morning to noon", [
+                    "Good morning",
+                    "Good evening",
+                ]),
+                ("at night", [
+                    "Good night",
+                    "Good bye",
+                ]),
+            ]
+        self.sections = sections
 
     def construct(self) -> None:
         """ Use only Builder interface
         """
-        self.builder.make_title("Greeting")
-        self.builder.make_string("from morning to noon")
-        self.builder.make_items([
-            "Good morning",
-            "Good evening",
-        ])
-        self.builder.make_string("at night")
-        self.builder.make_items([
-            "Good night",
-            "Good bye",
-        ])
+        self.builder.make_title(self.title)
+        for string, items in self.sections:
+            self.builder.make_string(string)
+            self.builder.make_items(items)
 
         self.builder.close()
 
@@ -54,49 +66,88 @@ class TextBuilder(Builder):
         self._buffer = []
 
     def make_title(self, title: str) -> None:
-        self._buffer.append(f"{'='*20}\n")
-        self._buffer.append(f"[ {title} ]\n")
-        self._buffer.append("\n")
+        self._write(f"{'='*20}\n")
+        self._write(f"[ {title} ]\n")
+        self._write("\n")
 
     def make_string(self, string: str) -> None:
-        self._buffer.append(f"> {string}\n")
-        self._buffer.append("\n")
+        self._write(f"> {string}\n")
+        self._write("\n")
 
     def make_items(self, items: list[str]) -> None:
         for item in items:
-            self._buffer.append(f"  - {item}\n")
-        self._buffer.append("\n")
+            self._write(f"  - {item}\n")
+        self._write("\n")
 
     def close(self) -> None:
-        self._buffer.append(f"{'='*20}\n")
+        self._write(f"{'='*20}\n")
 
     def get_result(self):
         return "".join(self._buffer)
 
+    def _write(self, text: str) -> None:
+        self._buffer.append(text)
+
 
 class HTMLBuilder(Builder):
     def __init__(self):
         self._buffer = []
 
     def make_title(self, title: str) -> None:
-        self._buffer.append(f"<html><head><title>{title}</title></head><body>")
-        self._buffer.append(f"<h1>{title}</h1>")
+        self._write(f"<html><head><title>{title}</title></head><body>")
+        self._write(f"<h1>{title}</h1>")
 
     def make_string(self, string: str) -> None:
-        self._buffer.append(f"<p>{string}</p>")
+        self._write(f"<p>{string}</p>")
 
     def make_items(self, items: list[str]) -> None:
-        self._buffer.append("<ul>")
+        self._write("<ul>")
         for item in items:
-            self._buffer.append(f"<li>{item}</li>")
-        self._buffer.append("</ul>")
+            self._write(f"<li>{item}</li>")
+        self._write("</ul>")
 
     def close(self) -> None:
-        self._buffer.append("</body></html>")
+        self._write("</body></html>")
 
     def get_result(self):
         return "".join(self._buffer)
 
+    def _write(self, text: str) -> None:
+        self._buffer.append(text)
+
+
+class StreamingBuilder(Builder):
+    """ Write the document to a sink as it is built instead of keeping it.
+
+    Combine with TextBuilder or HTMLBuilder. Writes to a file-like object
+    are gathered into chunks of about chunk_size characters; a socket can be
+    wrapped with socket.makefile("w").
+    """
+
+    def __init__(
+        self, fp: Union[IO[str], Sink], chunk_size: int = 65536
+    ):
+        super().__init__()
+        self.sink = fp if isinstance(fp, Sink) else FileSink(fp, chunk_size)
+
+    def close(self) -> None:
+        super().close()
+        self.sink.flush()
+
+    def get_result(self):
+        raise TypeError("the result is written to the sink")
+
+    def _write(self, text: str) -> None:
+        self.sink.write(text)
+
+
+class StreamingTextBuilder(StreamingBuilder, TextBuilder):
+    pass
+
+
+class StreamingHTMLBuilder(StreamingBuilder, HTMLBuilder):
+    pass
+
 
 if __name__ == "__main__":
     if len(sys.argv) != 2:
@@ -107,9 +158,15 @@ if __name__ == "__main__":
         builder = TextBuilder()
     elif target == "html":
         builder = HTMLBuilder()
+    elif target == "stream":
+        builder = StreamingHTMLBuilder(StdoutSink())
+        Director(builder).construct()
+        print()
+        exit()
     else:
         exit()
 
     director = Director(builder)
     director.construct()
-    print(builder.get_result())
+    with StdoutSink() as sink:
+        sink.write_line(builder.get_result())
@@ -0,0 +1,99 @@
+""" Builder Pattern (parallel)
+多数の文書の組み立てをプロセスプールに分散する。結果は入力と同じ順序で返し、
+保存先が指定された場合は各プロセスが組み立て終わった文書を直接書き出す
+"""
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+import os
+from typing import Any, Optional, Sequence
+
+from design_pattern.builder import Director, StreamingBuilder, TextBuilder
+
+# Director に渡すキーワード引数。例: {"title": ..., "sections": [...]}
+Spec = dict[str, Any]
+
+
+def _build(
+    spec: Spec, builder_cls: type, director_cls: type,
+    path: Optional[str] = None
+) -> str:
+    """ Build one document and return it, or write it to path.
+    """
+    if path is None:
+        builder = builder_cls()
+        director_cls(builder, **spec).construct()
+        return builder.get_result()
+
+    with open(path, "w", encoding="utf-8") as fp:
+        if issubclass(builder_cls, StreamingBuilder):
+            director_cls(builder_cls(fp), **spec).construct()
+        else:
+            builder = builder_cls()
+            director_cls(builder, **spec).construct()
+            fp.write(builder.get_result())
+    return path
+
+
+def _build_chunk(
+    specs: list[Spec], builder_cls: type, director_cls: type,
+    paths: Optional[list[str]]
+) -> list[str]:
+    if paths is None:
+        return [_build(spec, builder_cls, director_cls) for spec in specs]
+    return [
+        _build(spec, builder_cls, director_cls, path)
+        for spec, path in zip(specs, paths)
+    ]
+
+
+def build_many(
+    specs: Sequence[Spec],
+    builder_cls: type = TextBuilder,
+    workers: Optional[int] = None,
+    paths: Optional[Sequence[str]] = None,
+    director_cls: type = Director,
+) -> list[str]:
+    """ Build director_cls(builder, **spec) for every spec in a process
+    pool.
+
+    Returns the documents in the order of specs. When paths are given,
+    every document is written to the path at the same position as soon as
+    it is built, and the paths are returned instead. A StreamingBuilder
+    class then writes the document without keeping it in memory.
+    """
+    if paths is not None and len(paths) != len(specs):
+        raise ValueError("paths must have the same length as specs")
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        return _build_chunk(
+            list(specs), builder_cls, director_cls,
+            None if paths is None else list(paths),
+        )
+
+    chunk_size = max(1, -(-len(specs) // (workers * 4)))
+    starts = range(0, len(specs), chunk_size)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        chunks = executor.map(
+            _build_chunk,
+            [list(specs[i:i + chunk_size]) for i in starts],
+            repeat(builder_cls),
+            repeat(director_cls),
+            [
+                None if paths is None else list(paths[i:i + chunk_size])
+                for i in starts
+            ],
+        )
+        return [result for chunk in chunks for result in chunk]
+
+
+if __name__ == "__main__":
+    from design_pattern.builder import HTMLBuilder
+
+    specs = [
+        {"title": f"Report {i}", "sections": [("items", [str(i), str(i * i)])]}
+        for i in range(5)
+    ]
+    for document in build_many(specs, HTMLBuilder, workers=2):
+        print(document)
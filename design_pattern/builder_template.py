@@ -0,0 +1,179 @@
+""" Builder Pattern (template)
+Director による組み立てを一度だけ記録し、文書の形をテンプレートにする
+可変部分には Slot を渡しておき、固定部分はあらかじめ結合しておくので、
+データを差し込んで 1 回 join するだけで同じ文書が得られる
+"""
+from __future__ import annotations
+from typing import Any, Union
+
+from design_pattern.builder import Builder, Director, TextBuilder
+
+
+class Slot(object):
+    """ Placeholder for a value given to CompiledTemplate.render().
+
+    Pass it to Director in place of a string or a list of items.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.marker = f"\0{name}\0"
+
+    def __repr__(self):
+        return f"Slot({self.name!r})"
+
+
+class TemplateRecorder(Builder):
+    """ Builder that records the calls of a Director as a template.
+
+    Every call is rendered by a fresh instance of builder_cls, which must
+    build the same fragment for a call whatever was built before it.
+    """
+
+    def __init__(self, builder_cls: type = TextBuilder):
+        self.builder_cls = builder_cls
+        # 固定部分の文字列と、差し込む位置を表すタプルの並び
+        #   ("value", name), ("items", name, head, joiner, tail)
+        self._parts: list[Union[str, tuple]] = []
+
+    def make_title(self, title: Union[str, Slot]) -> None:
+        self._record("make_title", title)
+
+    def make_string(self, string: Union[str, Slot]) -> None:
+        self._record("make_string", string)
+
+    def make_items(self, items: Union[list[str], Slot]) -> None:
+        if not isinstance(items, Slot):
+            self._parts.append(self._render("make_items", items))
+            return
+
+        # 0, 1, 2 個の項目で組み立てた結果を比べて、項目ごとに繰り返す部分を
+        # 見つける
+        x = items.marker
+        y = f"\1{items.name}\1"
+        empty = self._render("make_items", [])
+        one = self._render("make_items", [x])
+        two = self._render("make_items", [x, y])
+
+        i = one.find(x)
+        if i < 0 or y not in two:
+            raise self._not_repeated()
+        # empty[:k] が項目の前、empty[k:] が項目の後ろに来るように分ける
+        for k in range(min(i, len(empty)), -1, -1):
+            end = len(one) - len(empty) + k
+            if one[:k] == empty[:k] and one[end:] == empty[k:] \
+                    and end >= i + len(x):
+                break
+        else:
+            raise self._not_repeated()
+        head = one[k:i]
+        tail = one[i + len(x):end]
+        j = two.index(y)
+        separator = two[k + len(head) + len(x) + len(tail):j - len(head)]
+        joiner = f"{tail}{separator}{head}"
+        if two != f"{empty[:k]}{head}{x}{joiner}{y}{tail}{empty[k:]}":
+            raise self._not_repeated()
+
+        self._parts.append(empty[:k])
+        self._parts.append(("items", items.name, head, joiner, tail))
+        self._parts.append(empty[k:])
+
+    def close(self) -> None:
+        self._parts.append(self._render("close"))
+
+    def compile(self) -> CompiledTemplate:
+        return CompiledTemplate(self._parts)
+
+    def _record(self, method: str, value: Union[str, Slot]) -> None:
+        if not isinstance(value, Slot):
+            self._parts.append(self._render(method, value))
+            return
+
+        fragments = self._render(method, value.marker).split(value.marker)
+        if len(fragments) == 1:
+            raise ValueError(
+                f"{self.builder_cls.__name__}.{method} does not pass "
+                f"{value!r} through to the result"
+            )
+        self._parts.append(fragments[0])
+        for fragment in fragments[1:]:
+            self._parts.append(("value", value.name))
+            self._parts.append(fragment)
+
+    def _not_repeated(self) -> ValueError:
+        return ValueError(
+            f"{self.builder_cls.__name__}.make_items does not repeat "
+            "the same fragment for every item"
+        )
+
+    def _render(self, method: str, *args: Any) -> str:
+        builder = self.builder_cls()
+        getattr(builder, method)(*args)
+        return builder.get_result()
+
+
+class CompiledTemplate(object):
+    """ Document with the static fragments joined and slots left open.
+    """
+
+    def __init__(self, parts: list[Union[str, tuple]]):
+        self.parts: list[str] = []
+        self.slots: list[tuple] = []
+        static = False
+        for part in parts:
+            if not isinstance(part, str):
+                self.slots.append((len(self.parts),) + part)
+                self.parts.append("")
+                static = False
+            elif static:
+                self.parts[-1] += part
+            else:
+                self.parts.append(part)
+                static = True
+
+        self._values = [
+            (index, name) for index, kind, name, *_ in self.slots
+            if kind == "value"
+        ]
+        self._items = [
+            (index, name, *items) for index, kind, name, *items in self.slots
+            if kind == "items"
+        ]
+
+    def render(self, **data: Union[str, list[str]]) -> str:
+        """ Fill the slots with data and return the document.
+        """
+        parts = self.parts[:]
+        for index, name in self._values:
+            parts[index] = data[name]
+        for index, name, head, joiner, tail in self._items:
+            items = data[name]
+            if items:
+                parts[index] = f"{head}{joiner.join(items)}{tail}"
+        return "".join(parts)
+
+
+def compile_director(
+    builder_cls: type = TextBuilder, director_cls: type = Director,
+    *args: Any, **kwargs: Any
+) -> CompiledTemplate:
+    """ Record one run of director_cls(recorder, *args, **kwargs).
+    """
+    recorder = TemplateRecorder(builder_cls)
+    director_cls(recorder, *args, **kwargs).construct()
+    return recorder.compile()
+
+
+if __name__ == "__main__":
+    from design_pattern.builder import HTMLBuilder
+
+    template = compile_director(
+        HTMLBuilder, Director, Slot("title"),
+        [(Slot("first"), Slot("first_items")), ("at night", Slot("items"))],
+    )
+    print(template.render(
+        title="Greeting",
+        first="from morning to noon",
+        first_items=["Good morning", "Good evening"],
+        items=["Good night", "Good bye"],
+    ))
@@ -5,9 +5,19 @@
 """
 from __future__ import annotations
 from abc import ABC, abstractmethod
+import hashlib
+from typing import IO, TYPE_CHECKING, Iterable, Iterator, Optional, Union
+
+from design_pattern.sink import default_sink, Sink
+
+if TYPE_CHECKING:
+    from design_pattern.composite_index import PathIndex
 
 
 class Entry(ABC):
+    __slots__ = ()
+    parent: Optional[Directory] = None
+
     @abstractmethod
     def get_name(self) -> str:
         pass
@@ -16,13 +26,65 @@ class Entry(ABC):
     def get_size(self) -> int:
         pass
 
-    @abstractmethod
-    def print_list(self, prefix: str = "") -> None:
-        pass
+    def get_children(self) -> Iterable[Entry]:
+        return ()
 
     def add(self, entry: Entry):
         raise NotImplementedError
 
+    def get_hash(self) -> bytes:
+        """ Content hash of the entry, derived from names and file sizes.
+        """
+        raise NotImplementedError
+
+    def iter_list(self, prefix: str = "") -> Iterator[str]:
+        """ Yield list lines lazily in depth-first order.
+
+        An explicit stack of child iterators is used instead of recursion,
+        so the depth of the tree is not limited by the recursion limit.
+        """
+        yield f"{prefix}/{self}"
+        stack = [(f"{prefix}/{self.get_name()}", iter(self.get_children()))]
+        while stack:
+            path, children = stack[-1]
+            for entry in children:
+                yield f"{path}/{entry}"
+                grandchildren = entry.get_children()
+                if grandchildren:
+                    stack.append(
+                        (f"{path}/{entry.get_name()}", iter(grandchildren))
+                    )
+                    break
+            else:
+                stack.pop()
+
+    def write_list(
+        self, fp: Union[IO[str], Sink], prefix: str = "",
+        buffer_size: int = 65536
+    ) -> None:
+        """ Write list lines to fp, batching them into large writes.
+        """
+        buf: list[str] = []
+        length = 0
+        for line in self.iter_list(prefix):
+            buf.append(line)
+            length += len(line) + 1
+            if length >= buffer_size:
+                buf.append("")
+                fp.write("\n".join(buf))
+                buf = []
+                length = 0
+
+        if buf:
+            buf.append("")
+            fp.write("\n".join(buf))
+
+    def print_list(
+        self, prefix: str = "", sink: Optional[Sink] = None
+    ) -> None:
+        with default_sink(sink) as sink:
+            self.write_list(sink, prefix)
+
     def __str__(self):
         return f"{self.get_name()}({self.get_size()})"
 
@@ -31,6 +93,7 @@ class File(Entry):
     def __init__(self, name: str, size: int):
         self.name = name
         self.size = size
+        self._hash: Optional[bytes] = None
 
     def get_name(self) -> str:
         return self.name
@@ -38,33 +101,132 @@ class File(Entry):
     def get_size(self) -> int:
         return self.size
 
-    def print_list(self, prefix: str = "") -> None:
-        print(f"{prefix}/{self}")
+    def get_hash(self) -> bytes:
+        if self._hash is None:
+            h = hashlib.blake2b(b"f", digest_size=16)
+            h.update(self.name.encode())
+            h.update(b"\0")
+            h.update(str(self.size).encode())
+            self._hash = h.digest()
+
+        return self._hash
+
+    def resize(self, size: int) -> None:
+        """ Change the file size and propagate the difference to ancestors.
+        """
+        delta = size - self.size
+        self.size = size
+        self._hash = None
+        if self.parent is not None:
+            self.parent._update_size(delta)
+            self.parent._invalidate_hash()
+
+    def remove(self) -> None:
+        """ Detach this file from its parent directory.
+        """
+        if self.parent is not None:
+            self.parent.remove(self)
 
 
 class Directory(Entry):
     def __init__(self, name: str):
         self.name = name
         self.directory: list[Entry] = []
+        # 配下の合計サイズ。変更があった場合は差分だけを祖先へ伝搬させる
+        self.size = 0
+        # このディレクトリを含むツリーのパス索引（PathIndex が設定する）
+        self.path_index: Optional[PathIndex] = None
+        # 子のハッシュから求めるハッシュ。変更があると祖先まで無効化される
+        self._hash: Optional[bytes] = None
 
     def get_name(self) -> str:
         return self.name
 
     def get_size(self) -> int:
-        size = 0
-        for d in self.directory:
-            size += d.get_size()
+        return self.size
 
-        return size
+    def get_children(self) -> Iterable[Entry]:
+        return self.directory
+
+    def get_hash(self) -> bytes:
+        """ Hash of the directory name and the hashes of its children.
+
+        Hashes are cached per directory, so only subtrees changed since the
+        last call are recomputed. The subtree is walked with an explicit
+        stack to compute the missing hashes children first.
+        """
+        stack = [(self, False)]
+        while stack:
+            d, ready = stack.pop()
+            if d._hash is not None:
+                continue
+            if not ready:
+                stack.append((d, True))
+                stack.extend(
+                    (c, False) for c in d.directory
+                    if isinstance(c, Directory) and c._hash is None
+                )
+                continue
+
+            h = hashlib.blake2b(b"d", digest_size=16)
+            h.update(d.name.encode())
+            h.update(b"\0")
+            for child_hash in sorted(c.get_hash() for c in d.directory):
+                h.update(child_hash)
+            d._hash = h.digest()
+
+        return self._hash
 
     def add(self, entry: Entry) -> Entry:
+        d: Optional[Directory] = self
+        while d is not None:
+            if d is entry:
+                raise ValueError(
+                    f"cannot add {entry.get_name()} into its own subtree"
+                )
+            d = d.parent
+
+        if entry.parent is not None:
+            entry.parent.remove(entry)
+
         self.directory.append(entry)
+        entry.parent = self
+        self._update_size(entry.get_size())
+        self._invalidate_hash()
+        if self.path_index is not None:
+            self.path_index.insert(entry)
+        return self
+
+    def remove(self, entry: Entry) -> Entry:
+        if self.path_index is not None:
+            self.path_index.discard(entry)
+        self.directory.remove(entry)
+        entry.parent = None
+        self._update_size(-entry.get_size())
+        self._invalidate_hash()
         return self
 
-    def print_list(self, prefix: str = "") -> None:
-        print(f"{prefix}/{self}")
-        for d in self.directory:
-            d.print_list(f"{prefix}/{self.name}")
+    def _update_size(self, delta: int) -> None:
+        """ Apply size delta to this directory and all of its ancestors.
+        """
+        if delta == 0:
+            return
+
+        d: Optional[Directory] = self
+        while d is not None:
+            d.size += delta
+            d = d.parent
+
+    def _invalidate_hash(self) -> None:
+        """ Drop cached hashes of this directory and all of its ancestors.
+
+        A directory hash is only computed after the hashes of its children,
+        so the walk can stop at the first directory without a cached hash.
+        """
+        d: Optional[Directory] = self
+        while d is not None and d._hash is not None:
+            d._hash = None
+            d = d.parent
 
 
 if __name__ == "__main__":
@@ -0,0 +1,292 @@
+""" Composite Pattern (compact tree)
+大量のエントリを扱うために、ツリー全体を並列な配列（列指向）で保持する。
+各エントリは配列の添字で表し、Entry と同じインターフェースを持つ軽量な
+ビューを通して File / Directory と同様に扱うことができる
+"""
+from __future__ import annotations
+from array import array
+from typing import Iterable, Iterator, Optional
+
+from design_pattern.composite import Entry
+
+
+class CompactTree(object):
+    """ Entry tree stored as parallel arrays indexed by entry number.
+
+    Children are linked through first_child/next_sibling so that no per
+    directory list is required. Names are stored once in a shared UTF-8
+    buffer and referenced by offset and length. Repeated names are found
+    through an open addressing table of entry numbers, compared against
+    the buffer, so no str object is kept per distinct name.
+    """
+    FILE = 0
+    DIRECTORY = 1
+    NO_ENTRY = -1
+
+    def __init__(self, root_name: str = "root"):
+        self.parent = array("i")
+        self.name_offset = array("q")
+        self.name_length = array("I")
+        self.size = array("q")
+        self.kind = array("b")
+        self.first_child = array("i")
+        self.last_child = array("i")
+        self.next_sibling = array("i")
+
+        self._names = bytearray()
+        # 名前の重複を除くためのハッシュ表。その名前を最初に使ったエントリの
+        # 番号を入れ、空きは NO_ENTRY
+        self._slots = array("i", [self.NO_ENTRY]) * 8
+        self._slots_used = 0
+
+        self._append(self.NO_ENTRY, root_name, 0, self.DIRECTORY)
+
+    def __len__(self) -> int:
+        return len(self.kind)
+
+    @property
+    def root(self) -> CompactDirectory:
+        return CompactDirectory(self, 0)
+
+    def view(self, index: int) -> CompactEntry:
+        if self.kind[index] == self.DIRECTORY:
+            return CompactDirectory(self, index)
+        return CompactFile(self, index)
+
+    def get_name(self, index: int) -> str:
+        offset = self.name_offset[index]
+        return self._names[offset:offset + self.name_length[index]].decode()
+
+    def children(self, index: int) -> Iterator[int]:
+        child = self.first_child[index]
+        while child != self.NO_ENTRY:
+            yield child
+            child = self.next_sibling[child]
+
+    def iter_list(self, index: int, prefix: str = "") -> Iterator[str]:
+        """ Yield list lines of the subtree directly from the arrays.
+        """
+        first_child = self.first_child
+        next_sibling = self.next_sibling
+        sizes = self.size
+        name = self.get_name(index)
+        yield f"{prefix}/{name}({sizes[index]})"
+
+        stack = [(f"{prefix}/{name}", first_child[index])]
+        while stack:
+            path, child = stack.pop()
+            while child != self.NO_ENTRY:
+                name = self.get_name(child)
+                yield f"{path}/{name}({sizes[child]})"
+                if first_child[child] != self.NO_ENTRY:
+                    stack.append((path, next_sibling[child]))
+                    path = f"{path}/{name}"
+                    child = first_child[child]
+                else:
+                    child = next_sibling[child]
+
+    def add_file(self, parent: int, name: str, size: int) -> int:
+        index = self._append(parent, name, size, self.FILE)
+        self._update_size(parent, size)
+        return index
+
+    def add_directory(self, parent: int, name: str) -> int:
+        return self._append(parent, name, 0, self.DIRECTORY)
+
+    def add_entry(self, parent: int, entry: Entry) -> int:
+        """ Copy an object tree (or another compact tree) under parent.
+        """
+        start = len(self)
+        rows = []
+        stack = [(parent, entry)]
+        while stack:
+            p, e = stack.pop()
+            if hasattr(e, "directory"):
+                rows.append((p, e.get_name(), None))
+                index = start + len(rows) - 1
+                stack.extend((index, c) for c in reversed(e.directory))
+            else:
+                rows.append((p, e.get_name(), e.get_size()))
+
+        self.bulk_load(rows)
+        return start
+
+    def bulk_load(
+        self, rows: Iterable[tuple[int, str, Optional[int]]]
+    ) -> None:
+        """ Append (parent index, name, size) rows in a single pass.
+
+        size is None for directories. Every parent must already exist, so
+        rows have to be ordered parents first. Directory sizes are
+        aggregated once at the end instead of per row.
+        """
+        start = len(self)
+        for parent, name, size in rows:
+            if size is None:
+                self._append(parent, name, 0, self.DIRECTORY)
+            else:
+                self._append(parent, name, size, self.FILE)
+
+        sizes = self.size
+        parents = self.parent
+        for index in range(len(self) - 1, start - 1, -1):
+            parent = parents[index]
+            if parent >= start:
+                sizes[parent] += sizes[index]
+            elif sizes[index]:
+                self._update_size(parent, sizes[index])
+
+    def _append(self, parent: int, name: str, size: int, kind: int) -> int:
+        if parent != self.NO_ENTRY and self.kind[parent] != self.DIRECTORY:
+            raise ValueError("parent must be a directory")
+
+        index = len(self.kind)
+        encoded = name.encode()
+        offset = self._intern(encoded, index)
+
+        self.parent.append(parent)
+        self.name_offset.append(offset)
+        self.name_length.append(len(encoded))
+        self.size.append(size)
+        self.kind.append(kind)
+        self.first_child.append(self.NO_ENTRY)
+        self.last_child.append(self.NO_ENTRY)
+        self.next_sibling.append(self.NO_ENTRY)
+
+        if parent != self.NO_ENTRY:
+            last = self.last_child[parent]
+            if last == self.NO_ENTRY:
+                self.first_child[parent] = index
+            else:
+                self.next_sibling[last] = index
+            self.last_child[parent] = index
+
+        return index
+
+    def _intern(self, encoded: bytes, index: int) -> int:
+        """ Return the offset of encoded in the name buffer, appending it
+        for the new entry index unless the same name is already there.
+        """
+        slots = self._slots
+        offsets = self.name_offset
+        lengths = self.name_length
+        names = self._names
+        n = len(encoded)
+        mask = len(slots) - 1
+        i = hash(encoded) & mask
+        while slots[i] != self.NO_ENTRY:
+            offset = offsets[slots[i]]
+            if lengths[slots[i]] == n and names[offset:offset + n] == encoded:
+                return offset
+            i = (i + 1) & mask
+
+        slots[i] = index
+        self._slots_used += 1
+        if self._slots_used * 2 > len(slots):
+            self._grow_slots(hash(encoded), index)
+        offset = len(names)
+        names += encoded
+        return offset
+
+    def _grow_slots(self, new_hash: int, new_index: int) -> None:
+        """ Double the name table. new_index is not in the arrays yet, so
+        its hash is passed in.
+        """
+        old = self._slots
+        size = len(old) * 2
+        mask = size - 1
+        slots = self._slots = array("i", [self.NO_ENTRY]) * size
+        for index in old:
+            if index == self.NO_ENTRY:
+                continue
+            if index == new_index:
+                h = new_hash
+            else:
+                offset = self.name_offset[index]
+                h = hash(bytes(
+                    self._names[offset:offset + self.name_length[index]]
+                ))
+            i = h & mask
+            while slots[i] != self.NO_ENTRY:
+                i = (i + 1) & mask
+            slots[i] = index
+
+    def _update_size(self, index: int, delta: int) -> None:
+        """ Apply size delta to the entry and all of its ancestors.
+        """
+        while index != self.NO_ENTRY:
+            self.size[index] += delta
+            index = self.parent[index]
+
+
+class CompactEntry(Entry):
+    """ Lightweight view of a single entry in CompactTree.
+    """
+    __slots__ = ("tree", "index")
+
+    def __init__(self, tree: CompactTree, index: int):
+        self.tree = tree
+        self.index = index
+
+    def __eq__(self, other: object) -> bool:
+        return (
+            isinstance(other, CompactEntry)
+            and self.tree is other.tree
+            and self.index == other.index
+        )
+
+    def __hash__(self) -> int:
+        return hash((id(self.tree), self.index))
+
+    @property
+    def parent(self) -> Optional[CompactDirectory]:
+        parent = self.tree.parent[self.index]
+        if parent == CompactTree.NO_ENTRY:
+            return None
+        return CompactDirectory(self.tree, parent)
+
+    def get_name(self) -> str:
+        return self.tree.get_name(self.index)
+
+    def get_size(self) -> int:
+        return self.tree.size[self.index]
+
+    def iter_list(self, prefix: str = "") -> Iterator[str]:
+        return self.tree.iter_list(self.index, prefix)
+
+
+class CompactFile(CompactEntry):
+    __slots__ = ()
+
+
+class CompactDirectory(CompactEntry):
+    __slots__ = ()
+
+    @property
+    def directory(self) -> list[CompactEntry]:
+        return [self.tree.view(i) for i in self.tree.children(self.index)]
+
+    def get_children(self) -> Iterable[CompactEntry]:
+        return self.directory
+
+    def add(self, entry: Entry) -> Entry:
+        self.tree.add_entry(self.index, entry)
+        return self
+
+
+if __name__ == "__main__":
+    from design_pattern.composite import Directory, File
+
+    print("Making root entries...")
+    bindir = Directory("bin")
+    bindir.add(File("vi", 10000))
+    bindir.add(File("latex", 20000))
+
+    tree = CompactTree("root")
+    rootdir = tree.root
+    rootdir.add(bindir)
+    rootdir.add(Directory("tmp"))
+    usr = tree.add_directory(0, "usr")
+    tree.add_file(usr, "index.html", 500)
+
+    rootdir.print_list()
@@ -0,0 +1,91 @@
+""" Composite Pattern (diff)
+2 つのツリーの差分を求める。各ディレクトリが持つハッシュが一致する
+サブツリーは読み飛ばすため、変更が少ないツリーほど速く比較できる
+"""
+from __future__ import annotations
+
+from design_pattern.composite import Directory, Entry
+
+
+class TreeDiff(object):
+    """ Result of diff(): paths added, removed and resized files.
+    """
+
+    def __init__(self):
+        self.added: list[str] = []
+        self.removed: list[str] = []
+        self.resized: list[tuple[str, int, int]] = []
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.resized)
+
+    def __str__(self) -> str:
+        lines = [f"+ {path}" for path in self.added]
+        lines += [f"- {path}" for path in self.removed]
+        lines += [
+            f"~ {path} ({old} -> {new})" for path, old, new in self.resized
+        ]
+        return "\n".join(lines)
+
+
+def diff(old: Entry, new: Entry) -> TreeDiff:
+    """ Compare two trees and report the entries that changed.
+
+    Subtrees whose hashes are equal are skipped, so the cost depends on the
+    number of changed directories rather than on the size of the trees.
+    Added or removed directories are reported once, without their contents.
+    """
+    result = TreeDiff()
+    stack = [(old, new, f"/{new.get_name()}")]
+    while stack:
+        o, n, path = stack.pop()
+        if o.get_hash() == n.get_hash():
+            continue
+
+        old_is_directory = isinstance(o, Directory)
+        new_is_directory = isinstance(n, Directory)
+        if not old_is_directory and not new_is_directory \
+                and o.get_size() != n.get_size():
+            result.resized.append((path, o.get_size(), n.get_size()))
+            continue
+        if not (old_is_directory and new_is_directory):
+            result.removed.append(path)
+            result.added.append(path)
+            continue
+
+        old_children = {c.get_name(): c for c in o.directory}
+        for c in n.directory:
+            name = c.get_name()
+            child_path = f"{path}/{name}"
+            old_child = old_children.pop(name, None)
+            if old_child is None:
+                result.added.append(child_path)
+            else:
+                stack.append((old_child, c, child_path))
+
+        for name in old_children:
+            result.removed.append(f"{path}/{name}")
+
+    return result
+
+
+if __name__ == "__main__":
+    from design_pattern.composite import File
+
+    def make_tree() -> Directory:
+        rootdir = Directory("root")
+        bindir = Directory("bin")
+        usrdir = Directory("usr")
+        rootdir.add(bindir)
+        rootdir.add(usrdir)
+        bindir.add(File("vi", 10000))
+        bindir.add(File("latex", 20000))
+        usrdir.add(File("index.html", 200))
+        return rootdir
+
+    old = make_tree()
+    new = make_tree()
+    new.directory[0].directory[0].resize(12000)
+    new.directory[1].add(File("memo.txt", 250))
+    new.directory[0].directory[1].remove()
+    print(diff(old, new))
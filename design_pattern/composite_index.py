@@ -0,0 +1,183 @@
+""" Composite Pattern (path index)
+ツリー全体のパスとエントリの対応表を保持し、ツリーを走査せずにエントリを
+検索できるようにする。索引は Directory.add / remove のたびに更新される
+"""
+from __future__ import annotations
+from fnmatch import fnmatchcase
+import re
+from typing import Iterable, Optional
+
+from design_pattern.composite import Directory, Entry
+
+
+class PathIndex(object):
+    """ Map full paths such as "/root/usr/foo" to entries of a tree.
+
+    Creating an index registers it on every directory of the tree, and the
+    directories keep it in sync on add() and remove().
+    """
+
+    def __init__(self, root: Directory):
+        self.root = root
+        self.paths: dict[str, Entry] = {}
+        self._path_of: dict[Entry, str] = {}
+        # 拡張子ごとのパスの集合。"**/*.html" のような検索に使う
+        self._by_extension: dict[str, dict[str, None]] = {}
+        self._insert_subtree(root, f"/{root.get_name()}")
+
+    def lookup(self, path: str) -> Optional[Entry]:
+        if len(path) > 1:
+            path = path.rstrip("/")
+        return self.paths.get(path)
+
+    def glob(self, pattern: str) -> list[Entry]:
+        """ Return entries whose path matches pattern.
+
+        Each component is matched with fnmatch rules and "**" matches any
+        number of directories. Literal components are resolved through the
+        index, so only the parts of the tree selected by wildcards are
+        visited. From the first "**" on, the rest of the pattern is matched
+        against the indexed paths instead of walking the subtree, and those
+        matches are returned in path order.
+        """
+        parts = pattern.strip("/").split("/")
+        if not fnmatchcase(self.root.get_name(), parts[0]):
+            return []
+
+        current = {f"/{self.root.get_name()}": self.root}
+        for i, part in enumerate(parts[1:], 1):
+            matched: dict[str, Entry] = {}
+            if part == "**":
+                return self._match_paths(current, parts[i:])
+            elif not _has_magic(part):
+                for path in current:
+                    entry = self.paths.get(f"{path}/{part}")
+                    if entry is not None:
+                        matched[f"{path}/{part}"] = entry
+            else:
+                for path, entry in current.items():
+                    for child in entry.get_children():
+                        if fnmatchcase(child.get_name(), part):
+                            matched[f"{path}/{child.get_name()}"] = child
+            current = matched
+
+        return list(current.values())
+
+    def insert(self, entry: Entry) -> None:
+        """ Register entry and its subtree under the path of its parent.
+        """
+        parent_path = self._path_of[entry.parent]
+        self._insert_subtree(entry, f"{parent_path}/{entry.get_name()}")
+
+    def discard(self, entry: Entry) -> None:
+        """ Unregister entry and its subtree.
+        """
+        stack = [entry]
+        while stack:
+            e = stack.pop()
+            path = self._path_of.pop(e, None)
+            if path is not None and self.paths.get(path) is e:
+                del self.paths[path]
+                self._by_extension[_extension(e.get_name())].pop(path, None)
+            if isinstance(e, Directory):
+                e.path_index = None
+                stack.extend(e.directory)
+
+    def _insert_subtree(self, entry: Entry, path: str) -> None:
+        stack = [(entry, path)]
+        while stack:
+            e, p = stack.pop()
+            self.paths[p] = e
+            self._path_of[e] = p
+            self._by_extension.setdefault(
+                _extension(e.get_name()), {}
+            )[p] = None
+            if isinstance(e, Directory):
+                e.path_index = self
+                stack.extend((c, f"{p}/{c.get_name()}") for c in e.directory)
+
+    def _match_paths(
+        self, bases: dict[str, Entry], parts: list[str]
+    ) -> list[Entry]:
+        """ Return the entries whose path is one of bases followed by parts.
+        """
+        if not bases:
+            return []
+        regex = re.compile(
+            "(?:" + "|".join(re.escape(base) for base in bases) + ")"
+            + "".join(
+                "(?:/[^/]+)*" if part == "**" else f"/{_translate(part)}"
+                for part in parts
+            ) + r"\Z"
+        )
+        candidates: Iterable[str] = self.paths
+        last = parts[-1]
+        if last.startswith("*") and not _has_magic(last[1:]) \
+                and _extension(last[1:]) == last[1:] != "":
+            candidates = self._by_extension.get(last[1:], ())
+        return [
+            self.paths[path]
+            for path in sorted(filter(regex.match, candidates))
+        ]
+
+
+def _extension(name: str) -> str:
+    """ Return name from its last dot, or "" without a dot.
+    """
+    i = name.rfind(".")
+    return name[i:] if i >= 0 else ""
+
+
+def _translate(part: str) -> str:
+    """ Translate one fnmatch component into a regex that stays within
+    the component.
+    """
+    out = []
+    i = 0
+    while i < len(part):
+        c = part[i]
+        i += 1
+        if c == "*":
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            # fnmatch と同じく、先頭の ! は否定、その直後の ] は文字として扱う
+            j = i + 1 if part[i:i + 1] == "!" else i
+            j = part.find("]", j + 1 if part[j:j + 1] == "]" else j)
+            if j < 0:
+                out.append(re.escape(c))
+                continue
+            body = part[i:j].replace("\\", "\\\\")
+            if body.startswith("!"):
+                body = f"^{body[1:]}"
+            elif body.startswith("^"):
+                body = f"\\{body}"
+            out.append(f"(?!/)[{body}]")
+            i = j + 1
+        else:
+            out.append(re.escape(c))
+    return "".join(out)
+
+
+def _has_magic(part: str) -> bool:
+    return any(c in part for c in "*?[")
+
+
+if __name__ == "__main__":
+    from design_pattern.composite import File
+
+    rootdir = Directory("root")
+    usrdir = Directory("usr")
+    foo = Directory("foo")
+    rootdir.add(usrdir)
+    usrdir.add(foo)
+
+    index = PathIndex(rootdir)
+    foo.add(File("index.html", 200))
+    foo.add(File("memo.txt", 250))
+    usrdir.add(File("sample.html", 500))
+
+    print(index.lookup("/root/usr/foo"))
+    for entry in index.glob("/root/**/*.html"):
+        print(entry)
@@ -0,0 +1,89 @@
+""" Composite Pattern (scanner)
+実際のディレクトリを走査して File / Directory のツリーを構築する。
+ディレクトリの読み出しはスレッドプールで並列に行い、ツリーの組み立ては
+呼び出し元のスレッドだけで行うことで、ロックを使わずに結果をまとめている
+"""
+from __future__ import annotations
+from concurrent.futures import (
+    FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+)
+import os
+from typing import Optional, Union
+
+from design_pattern.composite import Directory, Entry, File
+
+
+def _list_directory(path: str) -> tuple[list[tuple[str, int]], list[str]]:
+    """ Read one directory and return its files with sizes and subdirectories.
+
+    Runs in worker threads, so it only touches the filesystem and never the
+    Entry tree itself.
+    """
+    files: list[tuple[str, int]] = []
+    subdirectories: list[str] = []
+    try:
+        with os.scandir(path) as it:
+            for e in it:
+                try:
+                    if e.is_dir(follow_symlinks=False):
+                        subdirectories.append(e.name)
+                    else:
+                        files.append(
+                            (e.name, e.stat(follow_symlinks=False).st_size)
+                        )
+                except OSError:
+                    # 読み出し中に削除されたエントリなどは無視する
+                    continue
+    except OSError:
+        # os.walk と同様に、読み出せないディレクトリは空として扱う
+        pass
+
+    files.sort()
+    subdirectories.sort()
+    return files, subdirectories
+
+
+def scan(
+    path: Union[str, os.PathLike], workers: Optional[int] = None
+) -> Entry:
+    """ Build an Entry tree from a real directory.
+
+    Directories are read concurrently by `workers` threads. Each result is
+    merged into the tree by the calling thread as soon as it is ready, so
+    the tree is never mutated concurrently. Subdirectories are listed
+    before files, both in name order, regardless of completion order.
+    """
+    path = os.fspath(path)
+    name = os.path.basename(os.path.abspath(path))
+    if not os.path.isdir(path):
+        return File(name, os.stat(path).st_size)
+
+    root = Directory(name)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending: dict[Future, tuple[str, Directory]] = {
+            executor.submit(_list_directory, path): (path, root)
+        }
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                dirpath, directory = pending.pop(future)
+                files, subdirectories = future.result()
+                for subname in subdirectories:
+                    subpath = os.path.join(dirpath, subname)
+                    subdirectory = Directory(subname)
+                    directory.add(subdirectory)
+                    pending[executor.submit(_list_directory, subpath)] = (
+                        subpath, subdirectory
+                    )
+
+                for filename, size in files:
+                    directory.add(File(filename, size))
+
+    return root
+
+
+if __name__ == "__main__":
+    import sys
+
+    target = sys.argv[1] if len(sys.argv) > 1 else "."
+    scan(target).print_list()
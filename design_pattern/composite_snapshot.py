@@ -0,0 +1,148 @@
+""" Composite Pattern (snapshot)
+Entry のツリーをコンパクトなバイナリ形式で保存し、読み込み時はファイルを
+メモリマップする。サブツリーは実際にアクセスされたときに初めて Python の
+オブジェクトに変換されるため、巨大なツリーでもすぐに開くことができる
+
+ファイル形式:
+    ヘッダ、幅優先順に並べたエントリのレコード、名前の UTF-8 バイト列の順に並ぶ。
+    ディレクトリの子は連続したレコードとして格納される
+"""
+from __future__ import annotations
+from collections import deque
+import mmap
+import os
+import struct
+from typing import Union
+
+from design_pattern.composite import Directory, Entry, File
+
+MAGIC = b"DPSN"
+VERSION = 1
+
+# magic, version, entry count, offset of the name buffer
+_HEADER = struct.Struct("<4sHQQ")
+# size, name offset, name length, first child, child count, is directory
+_RECORD = struct.Struct("<qQIQI?")
+
+
+def save(tree: Entry, path: Union[str, os.PathLike]) -> None:
+    """ Write tree to path in the snapshot format.
+
+    Any entry that provides get_name() and get_size(), and a `directory`
+    list for containers, can be saved, so visitor trees work as well.
+    """
+    names = bytearray()
+    count = 1
+    queue = deque([tree])
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, 0, 0))
+        while queue:
+            entry = queue.popleft()
+            name = entry.get_name().encode()
+            children = getattr(entry, "directory", None)
+            f.write(_RECORD.pack(
+                entry.get_size(),
+                len(names),
+                len(name),
+                count,
+                0 if children is None else len(children),
+                children is not None,
+            ))
+            names += name
+            if children is not None:
+                queue.extend(children)
+                count += len(children)
+
+        names_offset = f.tell()
+        f.write(names)
+        f.seek(0)
+        f.write(_HEADER.pack(MAGIC, VERSION, count, names_offset))
+
+
+def load(path: Union[str, os.PathLike]) -> Entry:
+    """ Open a snapshot and return its root entry.
+
+    The file is memory-mapped and only the root record is decoded here.
+    """
+    with open(path, "rb") as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, version, count, names_offset = _HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{os.fspath(path)} is not a snapshot file")
+
+    return _Snapshot(buffer, count, names_offset).entry(0)
+
+
+class _Snapshot(object):
+    """ Reader of records in a memory-mapped snapshot.
+    """
+
+    def __init__(self, buffer: mmap.mmap, count: int, names_offset: int):
+        self.buffer = buffer
+        self.count = count
+        self.names_offset = names_offset
+
+    def entry(self, index: int) -> Entry:
+        size, name_offset, name_length, first_child, child_count, \
+            is_directory = _RECORD.unpack_from(
+                self.buffer, _HEADER.size + index * _RECORD.size
+            )
+        start = self.names_offset + name_offset
+        name = self.buffer[start:start + name_length].decode()
+        if is_directory:
+            return SnapshotDirectory(
+                self, name, size, first_child, child_count
+            )
+        return File(name, size)
+
+
+class SnapshotDirectory(Directory):
+    """ Directory whose children are read from the snapshot on first access.
+    """
+
+    def __init__(
+        self,
+        snapshot: _Snapshot,
+        name: str,
+        size: int,
+        first_child: int,
+        child_count: int,
+    ):
+        super().__init__(name)
+        self.size = size
+        self._snapshot = snapshot
+        self._first_child = first_child
+        self._child_count = child_count
+        self._loaded = False
+
+    @property
+    def directory(self) -> list[Entry]:
+        if not self._loaded:
+            self._loaded = True
+            for index in range(
+                self._first_child, self._first_child + self._child_count
+            ):
+                entry = self._snapshot.entry(index)
+                entry.parent = self
+                self._children.append(entry)
+
+        return self._children
+
+    @directory.setter
+    def directory(self, children: list[Entry]) -> None:
+        self._children = children
+
+
+if __name__ == "__main__":
+    rootdir = Directory("root")
+    bindir = Directory("bin")
+    usrdir = Directory("usr")
+    rootdir.add(bindir)
+    rootdir.add(usrdir)
+    bindir.add(File("vi", 10000))
+    bindir.add(File("latex", 20000))
+    usrdir.add(File("index.html", 200))
+
+    save(rootdir, "tree.snapshot")
+    load("tree.snapshot").print_list()
@@ -2,8 +2,13 @@
 ベースとなる機能を継承する形で次々に機能を付け加える（装飾する）
 同じインターフェースを実装することで、各機能をすべて同じものであるとみなせる
 """
+from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import final, Union
+from array import array
+from typing import final, Iterable, Iterator, Optional, Union
+
+from design_pattern.sink import default_sink, Sink
+from design_pattern.text_width import ljust, repeat, width
 
 
 class Display(ABC):
@@ -20,9 +25,102 @@ class Display(ABC):
         pass
 
     @final
-    def show(self) -> None:
-        for i in range(self.get_rows()):
-            print(self.get_row_text(i))
+    def show(
+        self, start: int = 0, stop: Optional[int] = None,
+        sink: Optional[Sink] = None
+    ) -> None:
+        """ Print the rows from start up to stop, like a slice.
+        """
+        with default_sink(sink) as sink:
+            for i in range(*slice(start, stop).indices(self.get_rows())):
+                sink.write_line(self.get_row_text(i))
+
+    def compile(self) -> CompiledDisplay:
+        """ Flatten the display into a layout that renders in one pass.
+
+        The layout is a snapshot; compile again after changing the display.
+        """
+        return CompiledDisplay(
+            [self.get_row_text(i) for i in range(self.get_rows())],
+            self.get_columns(),
+        )
+
+
+class CompiledDisplay(Display):
+    """ Precomputed layout of a display and the borders stacked on it.
+
+    Every border wraps all rows inside it with the same prefix and suffix,
+    so the rows of the innermost display share one prefix and one suffix.
+    A line added by a border (head and tail) is kept with the number of
+    wraps applied before it, and the wraps added after it are put around
+    it only when the row is built.
+    """
+
+    def __init__(self, body: list[str], columns: int):
+        # 枠が加えた行と、そのときまでに巻かれた回数。内側の行から順に並ぶ
+        self.head: list[tuple[str, int]] = []
+        self.body = body
+        self.tail: list[tuple[str, int]] = []
+        self.prefix = ""
+        self.suffix = ""
+        self.columns = columns
+        # i 回巻いた時点での prefix と suffix の長さ
+        self._prefix_lens = [0]
+        self._suffix_lens = [0]
+
+    def get_columns(self) -> int:
+        return self.columns
+
+    def get_rows(self) -> int:
+        return len(self.head) + len(self.body) + len(self.tail)
+
+    def get_row_text(self, row: int) -> Union[None, str]:
+        if row < 0:
+            return None
+        if row < len(self.head):
+            return self._line(*self.head[len(self.head) - 1 - row])
+        row -= len(self.head)
+        if row < len(self.body):
+            return f"{self.prefix}{self.body[row]}{self.suffix}"
+        row -= len(self.body)
+        if row < len(self.tail):
+            return self._line(*self.tail[row])
+        return None
+
+    def compile(self) -> CompiledDisplay:
+        return self
+
+    def render(self) -> str:
+        """ Return all rows joined by newlines.
+        """
+        inner = f"{self.suffix}\n{self.prefix}"
+        rows = [self._line(*line) for line in reversed(self.head)]
+        if self.body:
+            rows.append(f"{self.prefix}{inner.join(self.body)}{self.suffix}")
+        rows.extend(self._line(*line) for line in self.tail)
+        return "\n".join(rows)
+
+    def wrap(self, prefix: str, suffix: str) -> None:
+        """ Surround every row with prefix and suffix.
+        """
+        self.prefix = f"{prefix}{self.prefix}"
+        self.suffix = f"{self.suffix}{suffix}"
+        self._prefix_lens.append(len(self.prefix))
+        self._suffix_lens.append(len(self.suffix))
+        self.columns += width(prefix) + width(suffix)
+
+    def add_line(self, top: str, bottom: str) -> None:
+        """ Add a row above and below all rows.
+        """
+        wraps = len(self._prefix_lens) - 1
+        self.head.append((top, wraps))
+        self.tail.append((bottom, wraps))
+
+    def _line(self, line: str, wraps: int) -> str:
+        """ Surround a line added after `wraps` wraps with the later ones.
+        """
+        prefix = self.prefix[:len(self.prefix) - self._prefix_lens[wraps]]
+        return f"{prefix}{line}{self.suffix[self._suffix_lens[wraps]:]}"
 
 
 class StringDisplay(Display):
@@ -32,7 +130,7 @@ class StringDisplay(Display):
         self.string = string
 
     def get_columns(self) -> int:
-        return len(self.string)
+        return width(self.string)
 
     def get_rows(self) -> int:
         # ignore \n
@@ -46,32 +144,160 @@ class StringDisplay(Display):
 
 
 class MultiStringDisplay(Display):
-    def __init__(self):
+    def __init__(self, lines: Optional[Iterable[str]] = None):
         """ string must not include \n
+
+        lines are not read until the display is first used. Then all of
+        them are read and kept, because the width depends on every line.
+        Use from_file() to show part of a large file without keeping its
+        lines in memory.
+        """
+        self.strings: Union[list[str], _LineFile] = []
+        self.columns = 0
+        self._source: Optional[Iterator[str]] = \
+            None if lines is None else iter(lines)
+
+    @classmethod
+    def from_file(
+        cls, path: str, encoding: str = "utf-8"
+    ) -> MultiStringDisplay:
+        """ Display the lines of a text file without keeping them in memory.
+
+        Only the offset of every line is kept; rows are read from the file
+        when they are requested.
         """
-        self.strings = []
+        display = cls()
+        display.strings = _LineFile(path, encoding)
+        display.columns = display.strings.columns
+        return display
 
     def get_columns(self) -> int:
-        return max([len(string) for string in self.strings])
+        self._read()
+        return self.columns
 
     def get_rows(self) -> int:
+        self._read()
         return len(self.strings)
 
     def get_row_text(self, row: int) -> Union[None, str]:
-        if row < len(self.strings):
-            empty_len = self.get_columns() - len(self.strings[row])
-            return f"{self.strings[row]}{' '*empty_len}"
+        columns = self.get_columns()
+        if 0 <= row < len(self.strings):
+            return ljust(self.strings[row], columns)
         else:
             return None
 
     def add(self, string: str) -> None:
+        self._read()
         self.strings.append(string)
+        self.columns = max(self.columns, width(string))
+
+    def close(self) -> None:
+        """ Close the file opened by from_file().
+        """
+        if isinstance(self.strings, _LineFile):
+            self.strings.close()
+
+    def compile(self) -> CompiledDisplay:
+        columns = self.get_columns()
+        return CompiledDisplay(
+            [ljust(string, columns) for string in self.strings], columns
+        )
+
+    def _read(self) -> None:
+        """ Read all lines from the source, the first time one is needed.
+        """
+        if self._source is None:
+            return
+
+        strings = self.strings
+        columns = self.columns
+        for string in self._source:
+            strings.append(string)
+            w = width(string)
+            if w > columns:
+                columns = w
+        self.columns = columns
+        self._source = None
+
+
+class _LineFile(object):
+    """ Lines of a text file, read on demand through an index of offsets.
+    """
+
+    def __init__(self, path: str, encoding: str):
+        self.path = path
+        self.encoding = encoding
+        self.offsets = array("q", [0])
+        self.columns = 0
+        self.added: list[str] = []
+        self._fp = None
+
+        offset = 0
+        with open(path, "rb") as fp:
+            for line in fp:
+                w = width(line.decode(encoding).rstrip("\r\n"))
+                if w > self.columns:
+                    self.columns = w
+                offset += len(line)
+                self.offsets.append(offset)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1 + len(self.added)
+
+    def __getitem__(self, row: int) -> str:
+        lines = len(self.offsets) - 1
+        if row >= lines:
+            return self.added[row - lines]
+        if self._fp is None:
+            self._fp = open(self.path, "rb")
+        self._fp.seek(self.offsets[row])
+        line = self._fp.read(self.offsets[row + 1] - self.offsets[row])
+        return line.decode(self.encoding).rstrip("\r\n")
+
+    def __iter__(self) -> Iterator[str]:
+        with open(self.path, "rb") as fp:
+            for line in fp:
+                yield line.decode(self.encoding).rstrip("\r\n")
+        yield from self.added
+
+    def append(self, string: str) -> None:
+        self.added.append(string)
+
+    def close(self) -> None:
+        if self._fp is not None:
+            self._fp.close()
+            self._fp = None
 
 
 class Boader(Display):
     def __init__(self, display: Display):
         self.display = display
 
+    def compile(self) -> CompiledDisplay:
+        """ Compile the innermost display, then apply the borders from the
+        inside out.
+        """
+        layers = []
+        display: Display = self
+        while isinstance(display, Boader) \
+                and type(display)._compile_layer is not Boader._compile_layer:
+            layers.append(display)
+            display = display.display
+
+        if display is self:
+            return super().compile()
+        layout = display.compile()
+        for layer in reversed(layers):
+            layer._compile_layer(layout)
+        return layout
+
+    def _compile_layer(self, layout: CompiledDisplay) -> None:
+        """ Apply this border to the compiled layout of the inner display.
+
+        Borders that do not override this are compiled row by row.
+        """
+        raise NotImplementedError
+
 
 class SideBoader(Boader):
     def __init__(self, display: Display, char: str):
@@ -81,7 +307,7 @@ class SideBoader(Boader):
     def get_columns(self) -> int:
         """ Get length that is sum of boarder length at both side and containt.
         """
-        boader_len = len(self.boader_char)
+        boader_len = width(self.boader_char)
         return boader_len * 2 + self.display.get_columns()
 
     def get_rows(self) -> int:
@@ -94,6 +320,9 @@ class SideBoader(Boader):
             f"{self.boader_char}"
         )
 
+    def _compile_layer(self, layout: CompiledDisplay) -> None:
+        layout.wrap(self.boader_char, self.boader_char)
+
 
 class FullBoader(Boader):
     def __init__(self, display: Display):
@@ -122,6 +351,11 @@ class FullBoader(Boader):
         """
         return char * count
 
+    def _compile_layer(self, layout: CompiledDisplay) -> None:
+        layout.wrap("|", "|")
+        line = f"+{self.make_line('-', layout.columns - 2)}+"
+        layout.add_line(line, line)
+
 
 class UpDownBoader(Boader):
     def __init__(self, display: Display, char: str):
@@ -136,10 +370,14 @@ class UpDownBoader(Boader):
 
     def get_row_text(self, row: int) -> Union[None, str]:
         if row == 0 or row == (self.display.get_rows() + 1):
-            return f"{self.boader_char * self.get_columns()}"
+            return repeat(self.boader_char, self.get_columns())
         else:
             return self.display.get_row_text(row - 1)
 
+    def _compile_layer(self, layout: CompiledDisplay) -> None:
+        line = repeat(self.boader_char, layout.columns)
+        layout.add_line(line, line)
+
 
 if __name__ == "__main__":
     b1 = StringDisplay("Hello World")
@@ -171,3 +409,4 @@ if __name__ == "__main__":
         "#"
     )
     b4.show()
+    print(b4.compile().render())
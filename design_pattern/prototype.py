@@ -8,14 +8,17 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
 import copy
-from unicodedata import east_asian_width
+from typing import Optional
+
+from design_pattern.sink import default_sink, Sink
+from design_pattern.text_width import width
 
 
 class Product(ABC):
     """ The cloneable interface
     """
     @abstractmethod
-    def use(self, string: str) -> None:
+    def use(self, string: str, sink: Optional[Sink] = None) -> None:
         pass
 
     def create_clone(self) -> Product:
@@ -45,22 +48,17 @@ class MessageBox(Product):
 
         self.decochar = decochar
 
-    def use(self, string: str) -> None:
+    def use(self, string: str, sink: Optional[Sink] = None) -> None:
         # Always fill 2 char margins at both head and end.
-        length = 4
-        for c in string:
-            if east_asian_width(c) in "FWA":
-                # 全角文字は長さ 2 としてカウント
-                length += 2
-            else:
-                # それ以外は長さ 1 としてカウント
-                length += 1
-
-        print(self.decochar * length)
-        print()
-        print(f"{self.decochar} {string} {self.decochar}")
-        print()
-        print(self.decochar * length)
+        # 全角文字は長さ 2 としてカウント
+        length = 4 + width(string)
+
+        with default_sink(sink) as sink:
+            sink.write_line(self.decochar * length)
+            sink.write_line("")
+            sink.write_line(f"{self.decochar} {string} {self.decochar}")
+            sink.write_line("")
+            sink.write_line(self.decochar * length)
 
 
 class UnderLinePen(Product):
@@ -70,18 +68,13 @@ class UnderLinePen(Product):
 
         self.decochar = decochar
 
-    def use(self, string: str):
-        length = 0
-        for c in string:
-            if east_asian_width(c) in "FWA":
-                # 全角文字は長さ 2 としてカウント
-                length += 2
-            else:
-                # それ以外は長さ 1 としてカウント
-                length += 1
-
-        print(f'"{string}"')
-        print(f" {self.decochar * length} ")
+    def use(self, string: str, sink: Optional[Sink] = None):
+        # 全角文字は長さ 2 としてカウント
+        length = width(string)
+
+        with default_sink(sink) as sink:
+            sink.write_line(f'"{string}"')
+            sink.write_line(f" {self.decochar * length} ")
 
 
 if __name__ == "__main__":
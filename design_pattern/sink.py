@@ -0,0 +1,141 @@
+""" Sink
+表示処理の出力先。標準出力、メモリ上のバッファ、ファイル、破棄のいずれかを
+同じインターフェースで受け取れるようにする
+標準出力とファイルへは、行ごとではなくまとめて書き込む
+"""
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+import io
+import sys
+from typing import IO, Iterator, Optional, Union
+
+
+class Sink(ABC):
+    """ Destination of rendered text.
+    """
+
+    @abstractmethod
+    def write(self, text: str) -> None:
+        pass
+
+    def write_line(self, line: str) -> None:
+        self.write(f"{line}\n")
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> Sink:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class BufferedSink(Sink):
+    """ Sink that collects text and writes it out in large chunks.
+
+    buffer_size=0 writes every piece of text through immediately.
+    """
+
+    def __init__(self, buffer_size: int = 65536):
+        self.buffer_size = buffer_size
+        self._pending: list[str] = []
+        self._size = 0
+
+    def write(self, text: str) -> None:
+        self._pending.append(text)
+        self._size += len(text)
+        if self._size >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._pending:
+            text = "".join(self._pending)
+            self._pending = []
+            self._size = 0
+            self._write_out(text)
+
+    @abstractmethod
+    def _write_out(self, text: str) -> None:
+        pass
+
+
+class StdoutSink(BufferedSink):
+    """ Write to sys.stdout, looked up at every flush so that redirection
+    keeps working.
+    """
+
+    def _write_out(self, text: str) -> None:
+        sys.stdout.write(text)
+
+
+class FileSink(BufferedSink):
+    """ Write to a file given by path or an already opened text file.
+
+    Only a file opened by the sink is closed by close().
+    """
+
+    def __init__(
+        self, file: Union[str, IO[str]], buffer_size: int = 65536,
+        encoding: str = "utf-8"
+    ):
+        super().__init__(buffer_size)
+        if isinstance(file, str):
+            self.file: IO[str] = open(file, "w", encoding=encoding)
+            self._owned = True
+        else:
+            self.file = file
+            self._owned = False
+
+    def _write_out(self, text: str) -> None:
+        self.file.write(text)
+
+    def close(self) -> None:
+        self.flush()
+        if self._owned:
+            self.file.close()
+
+
+class BufferSink(Sink):
+    """ Keep the text in memory.
+    """
+
+    def __init__(self):
+        self._buffer = io.StringIO()
+
+    def write(self, text: str) -> None:
+        self._buffer.write(text)
+
+    def getvalue(self) -> str:
+        return self._buffer.getvalue()
+
+
+class NullSink(Sink):
+    """ Discard the text.
+    """
+
+    def write(self, text: str) -> None:
+        pass
+
+    def write_line(self, line: str) -> None:
+        pass
+
+
+@contextmanager
+def default_sink(sink: Optional[Sink] = None) -> Iterator[Sink]:
+    """ Yield sink, or a StdoutSink that is flushed on exit when sink is
+    None.
+    """
+    if sink is not None:
+        yield sink
+        return
+
+    sink = StdoutSink()
+    try:
+        yield sink
+    finally:
+        sink.flush()
@@ -6,33 +6,39 @@
 """
 
 from abc import ABC, abstractmethod
-from typing import final
-from unicodedata import east_asian_width
+from typing import final, Optional
+
+from design_pattern.sink import default_sink, Sink, StdoutSink
+from design_pattern.text_width import width
+
+# open() などを直接呼んだときの出力先
+_stdout = StdoutSink(buffer_size=0)
 
 
 class AbstractDisplay(ABC):
     @abstractmethod
-    def open(self):
+    def open(self, sink: Sink = _stdout):
         raise NotImplementedError
 
     @abstractmethod
-    def close(self):
+    def close(self, sink: Sink = _stdout):
         raise NotImplementedError
 
     @abstractmethod
-    def print(self):
+    def print(self, sink: Sink = _stdout):
         raise NotImplementedError
 
     @final
-    def display(self):
+    def display(self, sink: Optional[Sink] = None):
         """ Prohibits override
         """
-        self.open()
+        with default_sink(sink) as sink:
+            self.open(sink)
 
-        for i in range(0, 5):
-            self.print()
+            for i in range(0, 5):
+                self.print(sink)
 
-        self.close()
+            self.close(sink)
 
 
 class CharDisplay(AbstractDisplay):
@@ -44,14 +50,14 @@ class CharDisplay(AbstractDisplay):
             raise AttributeError
         self.c: str = c
 
-    def open(self):
-        print("<<")
+    def open(self, sink: Sink = _stdout):
+        sink.write_line("<<")
 
-    def close(self):
-        print(">>")
+    def close(self, sink: Sink = _stdout):
+        sink.write_line(">>")
 
-    def print(self):
-        print(self.c)
+    def print(self, sink: Sink = _stdout):
+        sink.write_line(self.c)
 
 
 class StringDisplay(AbstractDisplay):
@@ -60,26 +66,20 @@ class StringDisplay(AbstractDisplay):
 
     def __init__(self, string: str):
         self.string = string
-        self.width = 0
-        for c in self.string:
-            if east_asian_width(c) in "FWA":
-                # 全角文字は長さ 2 としてカウント
-                self.width += 2
-            else:
-                # それ以外は長さ 1 としてカウント
-                self.width += 1
-
-    def open(self):
-        self.print_frame()
-
-    def close(self):
-        self.print_frame()
-
-    def print(self):
-        print(f"|{self.string}|")
-
-    def print_frame(self):
-        print(f"+{'-'*self.width}+")
+        # 全角文字は長さ 2 としてカウント
+        self.width = width(self.string)
+
+    def open(self, sink: Sink = _stdout):
+        self.print_frame(sink)
+
+    def close(self, sink: Sink = _stdout):
+        self.print_frame(sink)
+
+    def print(self, sink: Sink = _stdout):
+        sink.write_line(f"|{self.string}|")
+
+    def print_frame(self, sink: Sink = _stdout):
+        sink.write_line(f"+{'-'*self.width}+")
 
 
 if __name__ == "__main__":
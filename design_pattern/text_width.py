@@ -0,0 +1,58 @@
+""" Text Width
+文字列を端末に表示したときの幅を求める
+全角文字 (east_asian_width が F, W, A) は 2、それ以外は 1 として数える
+ASCII だけの文字列はそのまま長さを返し、それ以外は文字ごとの幅を表に
+キャッシュしたうえで、同じ文字列の幅も覚えておく
+"""
+from __future__ import annotations
+from functools import lru_cache
+from unicodedata import east_asian_width
+
+# 一度調べた文字の幅
+_char_widths: dict[str, int] = {}
+
+
+def char_width(c: str) -> int:
+    """ Return the display width of a single character.
+    """
+    w = _char_widths.get(c)
+    if w is None:
+        w = _char_widths[c] = 2 if east_asian_width(c) in "FWA" else 1
+    return w
+
+
+def width(string: str) -> int:
+    """ Return the display width of string.
+    """
+    if string.isascii():
+        return len(string)
+    return _width(string)
+
+
+@lru_cache(maxsize=65536)
+def _width(string: str) -> int:
+    try:
+        return sum(map(_char_widths.__getitem__, string))
+    except KeyError:
+        # 表にない文字を登録してから数え直す
+        for c in set(string):
+            char_width(c)
+        return sum(map(_char_widths.__getitem__, string))
+
+
+def ljust(string: str, columns: int) -> str:
+    """ Pad string with spaces up to columns of display width.
+    """
+    return f"{string}{' ' * (columns - width(string))}"
+
+
+def repeat(char: str, columns: int) -> str:
+    """ Repeat char to fill columns of display width.
+
+    The remainder left by a wide char is filled with spaces. An empty
+    char gives an empty string.
+    """
+    w = width(char)
+    if w == 0:
+        return ""
+    return f"{char * (columns // w)}{' ' * (columns % w)}"
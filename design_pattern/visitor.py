@@ -4,47 +4,132 @@
 """
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import Union
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from enum import Enum
+from typing import Any, Callable, Iterator, Optional, Union
+import weakref
+
+
+class Control(Enum):
+    """ Signals that visit handlers may return to steer traverse().
+
+    Returning None is the same as CONTINUE.
+    """
+    CONTINUE = "continue"
+    SKIP_CHILDREN = "skip_children"
+    STOP = "stop"
 
 
 class Visitor(ABC):
-    @abstractmethod
+    """ Visitor driven by traverse().
+
+    Subclasses implement the handlers for the entry types they care about.
+    visit() walks the whole subtree of the given entry.
+    """
+
     def visit(self, entry: Union[Directory, File]) -> None:
+        traverse(entry, self)
+
+    def visit_file(self, entry: File) -> Optional[Control]:
+        pass
+
+    def visit_directory(self, entry: Directory) -> Optional[Control]:
+        pass
+
+    def prune(self, entry: Directory) -> bool:
+        """ Return True to skip entry and its subtree without visiting them.
+
+        traverse() only calls this when a subclass overrides it.
+        """
+        return False
+
+    def leave_directory(self, entry: Directory) -> None:
+        """ Called after all children of entry have been visited.
+        """
         pass
 
+    def merge(self, other: Visitor) -> None:
+        """ Fold the result of other, which visited the following part of
+        the tree, into this visitor.
+        """
+        raise NotImplementedError
+
+
+class MultiVisitor(Visitor):
+    """ Run several visitors in a single walk of the tree.
+
+    Each visitor keeps its own state, so results are read from the
+    individual visitors afterwards.
+    """
+
+    def __init__(self, *visitors: Visitor):
+        self.visitors = visitors
+
+    def visit(self, entry: Union[Directory, File]) -> None:
+        traverse(entry, *self.visitors)
+
 
 class ListVisitor(Visitor):
     def __init__(self, current_dir: str = ""):
         self.current_dir = current_dir
+        self._parent_dirs: list[str] = []
 
-    def visit(self, entry: Union[Directory, File]) -> None:
+    def visit_file(self, entry: File) -> None:
         print(f"{self.current_dir}/{entry}")
 
-        if isinstance(entry, Directory):
-            backup = self.current_dir
-            self.current_dir = f"{self.current_dir}//{entry.get_name()}"
-            for e in entry.directory:
-                e.accept(self)
+    def visit_directory(self, entry: Directory) -> None:
+        print(f"{self.current_dir}/{entry}")
+        self._parent_dirs.append(self.current_dir)
+        self.current_dir = f"{self.current_dir}//{entry.get_name()}"
 
-            self.current_dir = backup
+    def leave_directory(self, entry: Directory) -> None:
+        self.current_dir = self._parent_dirs.pop()
 
 
 class FileFindVisitor(Visitor):
-    def __init__(self, suffix: str):
+    """ Collect files whose name ends with suffix.
+
+    With limit, the walk stops as soon as that many files are found;
+    limit=1 finds the first match only.
+    """
+
+    def __init__(self, suffix: str, limit: Optional[int] = None):
         self.suffix = suffix
+        self.limit = limit
         self.found_file: list[File] = []
 
     def visit(self, entry: Union[Directory, File]) -> None:
-        if isinstance(entry, File) and entry.get_name().endswith(self.suffix):
+        """ Use the suffix index of entry instead of walking when it has one.
+        """
+        if isinstance(entry, Directory) and entry.suffix_index is not None:
+            self.found_file.extend(
+                entry.suffix_index.find(self.suffix, self._remaining())
+            )
+        else:
+            super().visit(entry)
+
+    def visit_file(self, entry: File) -> Optional[Control]:
+        if entry.get_name().endswith(self.suffix):
             self.found_file.append(entry)
+            if self.limit is not None and len(self.found_file) >= self.limit:
+                return Control.STOP
+        return None
 
-        if isinstance(entry, Directory):
-            for e in entry.directory:
-                e.accept(self)
+    def merge(self, other: FileFindVisitor) -> None:
+        self.found_file.extend(other.found_file[:self._remaining()])
 
     def get_found_file(self):
         return self.found_file
 
+    def get_first_file(self) -> Optional[File]:
+        return self.found_file[0] if self.found_file else None
+
+    def _remaining(self) -> Optional[int]:
+        if self.limit is None:
+            return None
+        return max(0, self.limit - len(self.found_file))
+
 
 class SizeVisitor(Visitor):
     def __init__(self):
@@ -53,13 +138,11 @@ class SizeVisitor(Visitor):
     def get_size(self) -> int:
         return self.size
 
-    def visit(self, entry: Union[Directory, File]) -> None:
-        if isinstance(entry, File):
-            self.size += entry.get_size()
+    def visit_file(self, entry: File) -> None:
+        self.size += entry.get_size()
 
-        if isinstance(entry, Directory):
-            for d in entry.directory:
-                d.accept(self)
+    def merge(self, other: SizeVisitor) -> None:
+        self.size += other.size
 
 
 class Element(ABC):
@@ -69,6 +152,8 @@ class Element(ABC):
 
 
 class Entry(Element):
+    parent: Optional[Directory] = None
+
     @abstractmethod
     def get_name(self) -> str:
         pass
@@ -103,23 +188,405 @@ class Directory(Entry):
     def __init__(self, name: str):
         self.name = name
         self.directory: list[Entry] = []
+        # このディレクトリを根とする接尾辞索引（SuffixIndex が設定する）
+        self.suffix_index: Optional[SuffixIndex] = None
+        # 配下が変更されるたびに増える版数。Visitor の結果のキャッシュに使う
+        self.version = 0
 
     def get_name(self) -> str:
         return self.name
 
     def get_size(self) -> int:
-        sv = SizeVisitor()
-        self.accept(sv)
-        return sv.get_size()
+        return _size_cache.visit(self, SizeVisitor).get_size()
 
     def add(self, entry: Entry) -> Entry:
+        d: Optional[Directory] = self
+        while d is not None:
+            if d is entry:
+                raise ValueError(
+                    f"cannot add {entry.get_name()} into its own subtree"
+                )
+            d = d.parent
+
+        if entry.parent is not None:
+            entry.parent.remove(entry)
+
         self.directory.append(entry)
+        entry.parent = self
+        self._touch()
+        for index in self._suffix_indexes():
+            index.insert(entry)
+        return self
+
+    def remove(self, entry: Entry) -> Entry:
+        for index in self._suffix_indexes():
+            index.discard(entry)
+        self.directory.remove(entry)
+        entry.parent = None
+        self._touch()
         return self
 
+    def _touch(self) -> None:
+        """ Bump the version of this directory and all of its ancestors.
+        """
+        d: Optional[Directory] = self
+        while d is not None:
+            d.version += 1
+            d = d.parent
+
+    def _suffix_indexes(self) -> Iterator[SuffixIndex]:
+        """ Yield the suffix indexes rooted at this directory and at its
+        ancestors, which all cover its subtree.
+        """
+        d: Optional[Directory] = self
+        while d is not None:
+            if d.suffix_index is not None:
+                yield d.suffix_index
+            d = d.parent
+
     def accept(self, visitor: Visitor) -> None:
         visitor.visit(self)
 
 
+class SuffixIndex(object):
+    """ Index of file names of a tree for suffix queries.
+
+    Names are kept reversed in sorted order, so all names ending with a
+    suffix form one contiguous range that is found by binary search.
+    Creating an index registers it on its root. Directory.add() and
+    remove() update every index rooted on the path from the changed
+    directory up, so indexes of nested subtrees stay up to date together.
+    """
+
+    def __init__(self, root: Directory):
+        self.root = root
+        rows = [
+            (file.get_name()[::-1], i, file)
+            for i, file in enumerate(_iter_files(root))
+        ]
+        rows.sort(key=lambda row: row[:2])
+
+        self._keys = [row[0] for row in rows]
+        self._files = [row[2] for row in rows]
+        # 走査順での各ファイルの位置。root の版数が変わったら数え直す
+        self._positions: dict[int, int] = {}
+        self._version: Optional[int] = None
+        root.suffix_index = self
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def find(self, suffix: str, limit: Optional[int] = None) -> list[File]:
+        """ Return files whose name ends with suffix, in the order a walk
+        of the tree finds them.
+
+        Runs in O(log n + m log m) for m matches. The first query after a
+        change of the tree walks it once more to number the files.
+        """
+        key = suffix[::-1]
+        start = bisect_left(self._keys, key)
+        stop = bisect_left(self._keys, f"{key}\U0010ffff", start)
+        positions = self._walk_positions()
+        matches = sorted(
+            self._files[start:stop], key=lambda f: positions[id(f)]
+        )
+        return matches[:limit]
+
+    def insert(self, entry: Entry) -> None:
+        """ Index entry and, for a directory, all files under it.
+        """
+        for file in _iter_files(entry):
+            key = file.get_name()[::-1]
+            i = bisect_right(self._keys, key)
+            self._keys.insert(i, key)
+            self._files.insert(i, file)
+
+    def discard(self, entry: Entry) -> None:
+        """ Unindex entry and, for a directory, all files under it.
+        """
+        for e in _iter_files(entry):
+            key = e.get_name()[::-1]
+            i = bisect_left(self._keys, key)
+            while i < len(self._keys) and self._keys[i] == key:
+                if self._files[i] is e:
+                    del self._keys[i], self._files[i]
+                    break
+                i += 1
+
+    def _walk_positions(self) -> dict[int, int]:
+        if self._version != self.root.version:
+            self._positions = {
+                id(f): i for i, f in enumerate(_iter_files(self.root))
+            }
+            self._version = self.root.version
+        return self._positions
+
+
+def _iter_files(entry: Entry) -> Iterator[File]:
+    """ Yield the files under entry in depth-first order.
+    """
+    stack = [entry]
+    while stack:
+        e = stack.pop()
+        if isinstance(e, Directory):
+            stack.extend(reversed(e.directory))
+        else:
+            yield e
+
+
+class VisitorCache(object):
+    """ Bounded LRU cache of visitor results per directory.
+
+    Only visitors that implement merge() and whose result depends on
+    nothing but the visited subtree can be cached. A cached result is
+    valid while the version of its directory is unchanged, so after a
+    mutation only the directories along the changed path are visited
+    again; the results of untouched subtrees are merged as they are.
+
+    Directories are only referenced weakly, and their results are dropped
+    when they are freed. A result that holds entries, such as the files of
+    a FileFindVisitor, keeps them alive until it is evicted.
+    """
+
+    def __init__(self, maxsize: int = 65536):
+        self.maxsize = maxsize
+        self._results: OrderedDict[
+            tuple, tuple[weakref.ref[Directory], int, Visitor]
+        ] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def clear(self) -> None:
+        self._results.clear()
+
+    def visit(self, entry: Entry, visitor_cls: type, *args: Any) -> Visitor:
+        """ Return a new visitor_cls(*args) holding the result for entry.
+        """
+        result = visitor_cls(*args)
+        if isinstance(entry, Directory):
+            result.merge(self._get(entry, visitor_cls, args))
+        else:
+            traverse(entry, result)
+        return result
+
+    def _lookup(
+        self, directory: Directory, visitor_cls: type, args: tuple
+    ) -> Optional[Visitor]:
+        key = (visitor_cls, args, id(directory))
+        cached = self._results.get(key)
+        if cached is None or cached[0]() is not directory \
+                or cached[1] != directory.version:
+            return None
+        self._results.move_to_end(key)
+        return cached[2]
+
+    def _store(
+        self, directory: Directory, visitor_cls: type, args: tuple,
+        result: Visitor
+    ) -> None:
+        key = (visitor_cls, args, id(directory))
+        ref = weakref.ref(directory, lambda _: self._results.pop(key, None))
+        self._results[key] = (ref, directory.version, result)
+        self._results.move_to_end(key)
+        if len(self._results) > self.maxsize:
+            self._results.popitem(last=False)
+
+    def _get(
+        self, root: Directory, visitor_cls: type, args: tuple
+    ) -> Visitor:
+        # この呼び出しで求めた結果。キャッシュから追い出されても参照できるようにする
+        computed: dict[int, Visitor] = {}
+        stack = [(root, False)]
+        while stack:
+            d, ready = stack.pop()
+            if id(d) in computed:
+                continue
+            if not ready:
+                cached = self._lookup(d, visitor_cls, args)
+                if cached is not None:
+                    computed[id(d)] = cached
+                    continue
+                stack.append((d, True))
+                stack.extend(
+                    (c, False) for c in d.directory
+                    if isinstance(c, Directory)
+                )
+                continue
+
+            result = visitor_cls(*args)
+            result.visit_directory(d)
+            for c in d.directory:
+                if isinstance(c, Directory):
+                    result.merge(computed[id(c)])
+                else:
+                    result.visit_file(c)
+            result.leave_directory(d)
+            computed[id(d)] = result
+            self._store(d, visitor_cls, args, result)
+
+        return computed[id(root)]
+
+
+_size_cache = VisitorCache()
+
+
+# エントリの型から Visitor のハンドラ名と、子を持つかどうかを引く表
+_HANDLERS: dict[type, tuple[str, bool]] = {
+    File: ("visit_file", False),
+    Directory: ("visit_directory", True),
+}
+
+
+def _lookup_handler(cls: type) -> tuple[str, bool]:
+    """ Resolve the handler of a subclass through its MRO and cache it.
+    """
+    for base in cls.__mro__:
+        if base in _HANDLERS:
+            _HANDLERS[cls] = _HANDLERS[base]
+            return _HANDLERS[cls]
+
+    raise TypeError(f"{cls.__name__} cannot be visited")
+
+
+def traverse(root: Entry, *visitors: Visitor) -> None:
+    """ Visit root and all of its descendants in depth-first order.
+
+    The tree is walked with an explicit stack of child iterators, so deep
+    trees do not hit the recursion limit. Handlers are bound once per
+    entry type instead of being chosen with isinstance() for every entry.
+    When several visitors are given, each entry is passed to all of them
+    in order during the same walk.
+
+    Each visitor is steered on its own: a directory pruned or answered with
+    SKIP_CHILDREN by one visitor is still walked for the others, and a
+    visitor that returns STOP receives no further calls. The walk ends
+    when every visitor has stopped.
+    """
+    if len(visitors) == 1:
+        _traverse_one(root, visitors[0])
+        return
+
+    stop = Control.STOP
+    skip_children = Control.SKIP_CHILDREN
+    table: dict[type, tuple[tuple[Callable[[Entry], Any], ...], bool]] = {}
+    leaves = tuple(v.leave_directory for v in visitors)
+    prunes = tuple(
+        v.prune if type(v).prune is not Visitor.prune else None
+        for v in visitors
+    )
+    n = len(visitors)
+    stopped = [False] * n
+    running = n
+    everyone = tuple(range(n))
+
+    # (directory, children, visitors that entered it, visitors to descend)
+    stack: list[tuple[
+        Optional[Directory], Iterator[Entry], tuple[int, ...], tuple[int, ...]
+    ]] = [(None, iter((root,)), (), everyone)]
+    while stack:
+        directory, children, entered, active = stack[-1]
+        for entry in children:
+            cls = type(entry)
+            handler = table.get(cls)
+            if handler is None:
+                name, has_children = _HANDLERS.get(cls) or _lookup_handler(cls)
+                handler = table[cls] = (
+                    tuple(getattr(v, name) for v in visitors), has_children
+                )
+
+            if not handler[1]:
+                if active is everyone and running == n:
+                    # 誰も止まっていない場合は添字を引かずに順に呼び出す
+                    for visit in handler[0]:
+                        if visit(entry) is stop:
+                            i = handler[0].index(visit)
+                            stopped[i] = True
+                            running -= 1
+                else:
+                    for i in active:
+                        if not stopped[i] and handler[0][i](entry) is stop:
+                            stopped[i] = True
+                            running -= 1
+                if running == 0:
+                    return
+                continue
+
+            visited = []
+            descend = []
+            for i in active:
+                if stopped[i] or (prunes[i] is not None and prunes[i](entry)):
+                    continue
+                signal = handler[0][i](entry)
+                if signal is stop:
+                    stopped[i] = True
+                    running -= 1
+                    continue
+                visited.append(i)
+                if signal is not skip_children:
+                    descend.append(i)
+            if running == 0:
+                return
+
+            if descend:
+                if len(descend) < len(active):
+                    active = tuple(descend)
+                stack.append(
+                    (entry, iter(entry.directory), tuple(visited), active)
+                )
+                break
+            for i in visited:
+                leaves[i](entry)
+        else:
+            stack.pop()
+            for i in entered:
+                if not stopped[i]:
+                    leaves[i](directory)
+
+
+def _traverse_one(root: Entry, visitor: Visitor) -> None:
+    """ traverse() specialised for a single visitor.
+    """
+    stop = Control.STOP
+    skip_children = Control.SKIP_CHILDREN
+    table: dict[type, tuple[Callable[[Entry], Any], bool]] = {}
+    leave = visitor.leave_directory
+    prune = visitor.prune if type(visitor).prune is not Visitor.prune \
+        else None
+
+    stack: list[tuple[Optional[Directory], Iterator[Entry]]] = [
+        (None, iter((root,)))
+    ]
+    while stack:
+        directory, children = stack[-1]
+        for entry in children:
+            cls = type(entry)
+            handler = table.get(cls)
+            if handler is None:
+                name, has_children = _HANDLERS.get(cls) or _lookup_handler(cls)
+                handler = table[cls] = (getattr(visitor, name), has_children)
+
+            if not handler[1]:
+                if handler[0](entry) is stop:
+                    return
+                continue
+
+            if prune is not None and prune(entry):
+                continue
+            signal = handler[0](entry)
+            if signal is stop:
+                return
+            if signal is skip_children:
+                leave(entry)
+                continue
+            stack.append((entry, iter(entry.directory)))
+            break
+        else:
+            stack.pop()
+            if directory is not None:
+                leave(directory)
+
+
 if __name__ == "__main__":
     print("Making root entries...")
     rootdir = Directory("root")
@@ -0,0 +1,145 @@
+""" Visitor Pattern (asyncio)
+ファイル内容のハッシュや stat の取り直しのように I/O 待ちが長い処理を、
+コルーチンの Visitor として同時に実行する。同時実行数はセマフォで制限し、
+結果は同期版の traverse() と同じ順序で collect() に渡す
+"""
+from __future__ import annotations
+from abc import ABC
+import asyncio
+from collections import deque
+from typing import Any, Iterator, Optional
+
+from design_pattern.visitor import (
+    _HANDLERS, Directory, Entry, File, _lookup_handler
+)
+
+
+class AsyncVisitor(ABC):
+    """ Visitor whose handlers are coroutines, driven by traverse_async().
+
+    Handlers return a result instead of a Control signal. The results are
+    passed to collect() one by one in the order traverse() would visit the
+    entries, however the handlers finish.
+    """
+
+    concurrency = 16
+
+    async def visit(self, entry: Entry) -> None:
+        await traverse_async(entry, self)
+
+    async def visit_file(self, entry: File) -> Any:
+        pass
+
+    async def visit_directory(self, entry: Directory) -> Any:
+        pass
+
+    def prune(self, entry: Directory) -> bool:
+        """ Return True to skip entry and its subtree without visiting them.
+        """
+        return False
+
+    def collect(self, entry: Entry, result: Any) -> None:
+        """ Receive the result of the handler that visited entry.
+        """
+        pass
+
+
+class AsyncFileFindVisitor(AsyncVisitor):
+    """ FileFindVisitor for handlers that have to wait before deciding.
+    """
+
+    def __init__(self, suffix: str):
+        self.suffix = suffix
+        self.found_file: list[File] = []
+
+    async def visit_file(self, entry: File) -> bool:
+        return entry.get_name().endswith(self.suffix)
+
+    def collect(self, entry: Entry, result: Any) -> None:
+        if result:
+            self.found_file.append(entry)
+
+    def get_found_file(self) -> list[File]:
+        return self.found_file
+
+
+async def traverse_async(
+    root: Entry, visitor: AsyncVisitor, concurrency: Optional[int] = None
+) -> None:
+    """ Visit the subtree of root with at most `concurrency` handlers
+    running at once.
+    """
+    semaphore = asyncio.Semaphore(concurrency or visitor.concurrency)
+    pending: deque[tuple[Entry, asyncio.Task]] = deque()
+
+    async def run(handler, entry: Entry) -> Any:
+        try:
+            return await handler(entry)
+        finally:
+            semaphore.release()
+
+    try:
+        for entry in _preorder(root, visitor):
+            await semaphore.acquire()
+            name, _ = _HANDLERS.get(type(entry)) \
+                or _lookup_handler(type(entry))
+            task = asyncio.ensure_future(run(getattr(visitor, name), entry))
+            pending.append((entry, task))
+            # 先頭から終わっているものだけを順に渡す
+            while pending and pending[0][1].done():
+                entry, task = pending.popleft()
+                visitor.collect(entry, task.result())
+
+        while pending:
+            entry, task = pending[0]
+            result = await task
+            pending.popleft()
+            visitor.collect(entry, result)
+    finally:
+        for _, task in pending:
+            task.cancel()
+
+
+def _preorder(root: Entry, visitor: AsyncVisitor) -> Iterator[Entry]:
+    """ Yield the entries in the order traverse() visits them.
+    """
+    prune = visitor.prune if type(visitor).prune is not AsyncVisitor.prune \
+        else None
+    stack: list[Iterator[Entry]] = [iter((root,))]
+    while stack:
+        for entry in stack[-1]:
+            cls = type(entry)
+            if not (_HANDLERS.get(cls) or _lookup_handler(cls))[1]:
+                yield entry
+                continue
+            if prune is not None and prune(entry):
+                continue
+            yield entry
+            stack.append(iter(entry.directory))
+            break
+        else:
+            stack.pop()
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    class SlowFindVisitor(AsyncFileFindVisitor):
+        async def visit_file(self, entry: File) -> bool:
+            await asyncio.sleep(random.uniform(0.05, 0.1))
+            return await super().visit_file(entry)
+
+    rootdir = Directory("root")
+    for i in range(10):
+        d = Directory(f"dir{i}")
+        rootdir.add(d)
+        for j in range(10):
+            d.add(File(f"file{i}-{j}.{'html' if j % 3 == 0 else 'txt'}", j))
+
+    visitor = SlowFindVisitor(".html")
+    start = time.perf_counter()
+    asyncio.run(visitor.visit(rootdir))
+    print(f"{time.perf_counter() - start:.2f}s")
+    for f in visitor.get_found_file():
+        print(f)
@@ -0,0 +1,174 @@
+""" Visitor Pattern (parallel)
+ツリーを最上位のサブツリーごとに分割し、プロセスプールで Visitor を並列に
+実行する。各プロセスの結果は Visitor の merge() で元の順序どおりにまとめる
+"""
+from __future__ import annotations
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+import io
+from itertools import repeat
+import os
+import pickle
+from typing import Any, Optional
+
+from design_pattern.visitor import Directory, Entry, File, Visitor, traverse
+
+# ワーカーに渡すサブツリーの形式
+#   (名前のリスト, ファイルサイズの配列, 子の数の配列。ファイルは -1)
+Payload = tuple[list[str], bytes, bytes]
+
+
+def encode(roots: list[Entry]) -> tuple[Payload, list[Entry]]:
+    """ Flatten subtrees into a compact payload in depth-first order.
+
+    Also returns the entries in the same order, so that entries referenced
+    by a worker's result can be mapped back to the original objects.
+    """
+    names: list[str] = []
+    sizes = array("q")
+    counts = array("q")
+    entries: list[Entry] = []
+    stack = list(reversed(roots))
+    while stack:
+        entry = stack.pop()
+        entries.append(entry)
+        names.append(entry.get_name())
+        if isinstance(entry, Directory):
+            sizes.append(0)
+            counts.append(len(entry.directory))
+            stack.extend(reversed(entry.directory))
+        else:
+            sizes.append(entry.get_size())
+            counts.append(-1)
+
+    return (names, sizes.tobytes(), counts.tobytes()), entries
+
+
+def decode(payload: Payload) -> tuple[list[Entry], list[Entry]]:
+    """ Rebuild the subtrees of encode() and return (roots, entries).
+    """
+    names, size_bytes, count_bytes = payload
+    sizes = array("q")
+    sizes.frombytes(size_bytes)
+    counts = array("q")
+    counts.frombytes(count_bytes)
+
+    roots: list[Entry] = []
+    entries: list[Entry] = []
+    # (directory, number of children still to be attached)
+    pending: list[list[Any]] = []
+    for name, size, count in zip(names, sizes, counts):
+        entry: Entry = File(name, size) if count < 0 else Directory(name)
+        entries.append(entry)
+        if pending:
+            pending[-1][0].add(entry)
+            pending[-1][1] -= 1
+            if pending[-1][1] == 0:
+                pending.pop()
+        else:
+            roots.append(entry)
+
+        if count > 0:
+            pending.append([entry, count])
+
+    return roots, entries
+
+
+class _EntryPickler(pickle.Pickler):
+    """ Pickle entries of the rebuilt subtrees as their ordinals.
+    """
+
+    def __init__(self, file: io.BytesIO, ordinals: dict[int, int]):
+        super().__init__(file, pickle.HIGHEST_PROTOCOL)
+        self.ordinals = ordinals
+
+    def persistent_id(self, obj: Any) -> Optional[int]:
+        if isinstance(obj, Entry):
+            return self.ordinals.get(id(obj))
+        return None
+
+
+class _EntryUnpickler(pickle.Unpickler):
+    """ Resolve ordinals written by _EntryPickler to the original entries.
+    """
+
+    def __init__(self, file: io.BytesIO, entries: list[Entry]):
+        super().__init__(file)
+        self.entries = entries
+
+    def persistent_load(self, pid: int) -> Entry:
+        return self.entries[pid]
+
+
+def _visit_payload(
+    payload: Payload, visitor_cls: type, args: tuple
+) -> bytes:
+    roots, entries = decode(payload)
+    visitor = visitor_cls(*args)
+    for root in roots:
+        traverse(root, visitor)
+
+    buf = io.BytesIO()
+    ordinals = {id(e): i for i, e in enumerate(entries)}
+    _EntryPickler(buf, ordinals).dump(visitor)
+    return buf.getvalue()
+
+
+def parallel_visit(
+    root: Entry,
+    visitor_cls: type,
+    *args: Any,
+    workers: Optional[int] = None,
+) -> Visitor:
+    """ Run visitor_cls(*args) over root using a process pool.
+
+    The children of root are split into contiguous chunks that are sent to
+    the workers as compact payloads. Partial visitors are merged in chunk
+    order, so the result matches a serial run, and entries held by the
+    result are the objects of the original tree.
+    """
+    visitor = visitor_cls(*args)
+    if type(visitor).merge is Visitor.merge:
+        raise TypeError(f"{visitor_cls.__name__} does not implement merge()")
+    if not isinstance(root, Directory):
+        traverse(root, visitor)
+        return visitor
+
+    workers = workers or os.cpu_count() or 1
+    children = root.directory
+    chunk_size = max(1, -(-len(children) // (workers * 4)))
+    chunks = [
+        encode(children[i:i + chunk_size])
+        for i in range(0, len(children), chunk_size)
+    ]
+
+    visitor.visit_directory(root)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(
+            _visit_payload,
+            [payload for payload, _ in chunks],
+            repeat(visitor_cls),
+            repeat(args),
+        )
+        for (_, entries), result in zip(chunks, results):
+            visitor.merge(_EntryUnpickler(io.BytesIO(result), entries).load())
+    visitor.leave_directory(root)
+
+    return visitor
+
+
+if __name__ == "__main__":
+    from design_pattern.visitor import FileFindVisitor, SizeVisitor
+
+    rootdir = Directory("root")
+    bindir = Directory("bin")
+    usrdir = Directory("usr")
+    rootdir.add(bindir)
+    rootdir.add(usrdir)
+    bindir.add(File("vi.md", 10000))
+    usrdir.add(File("index.html", 200))
+    usrdir.add(File("sample.html", 500))
+
+    print(parallel_visit(rootdir, SizeVisitor).get_size())
+    for f in parallel_visit(rootdir, FileFindVisitor, ".html").found_file:
+        print(f)
@@ -0,0 +1,250 @@
+""" Visitor Pattern (query)
+name ~ "*.txt" and size > 100 under "/root/usr" のような簡単な問い合わせを
+1 つの Visitor にコンパイルする。条件は Python の関数として一度だけ生成し、
+under による開始位置の絞り込み、サイズによる枝刈り、接尾辞索引を利用する
+
+文法:
+    query   := expr ["under" STRING]
+    expr    := term ("or" term)*
+    term    := factor ("and" factor)*
+    factor  := "not" factor | "(" expr ")" | field op value
+    field   := "name" | "size"
+    op      := "~" | "==" | "!=" | "<" | "<=" | ">" | ">="
+"""
+from __future__ import annotations
+from fnmatch import translate
+import re
+from typing import Any, Callable, Optional, Union
+
+from design_pattern.visitor import (
+    Directory, Entry, File, Visitor, traverse
+)
+
+_TOKEN = re.compile(r"""
+    \s*(?:
+        (?P<string>"(?:[^"\\]|\\.)*")
+      | (?P<number>\d+)
+      | (?P<op>~|==|!=|<=|>=|<|>|\(|\))
+      | (?P<word>[A-Za-z_]+)
+    )""", re.VERBOSE)
+
+_NAME_OPS = {"~", "==", "!="}
+_SIZE_OPS = {"==", "!=", "<", "<=", ">", ">="}
+
+# (kind, ...) の形の構文木
+#   ("or", [node, ...]), ("and", [node, ...]), ("not", node),
+#   ("cmp", field, op, value)
+Node = tuple
+
+
+def _tokenize(text: str) -> list[tuple[str, str]]:
+    tokens = []
+    pos = 0
+    text = text.rstrip()
+    while pos < len(text):
+        m = _TOKEN.match(text, pos)
+        if m is None:
+            raise ValueError(f"unexpected character at {pos}: {text[pos:]!r}")
+        kind = m.lastgroup
+        value = m.group(kind)
+        if kind == "string":
+            value = re.sub(r"\\(.)", r"\1", value[1:-1])
+        tokens.append((kind, value))
+        pos = m.end()
+
+    return tokens
+
+
+def _is_suffix_glob(pattern: str) -> bool:
+    """ True for patterns like "*.txt" that only constrain the suffix.
+    """
+    return pattern.startswith("*") and not re.search(r"[*?\[]", pattern[1:])
+
+
+class _Parser(object):
+    def __init__(self, text: str):
+        self.tokens = _tokenize(text)
+        self.pos = 0
+
+    def parse(self) -> tuple[Node, Optional[str]]:
+        node = self.expr()
+        under = None
+        if self._accept("word", "under"):
+            under = self._expect("string")
+        if self.pos < len(self.tokens):
+            raise ValueError(f"unexpected token {self.tokens[self.pos][1]!r}")
+        return node, under
+
+    def expr(self) -> Node:
+        nodes = [self.term()]
+        while self._accept("word", "or"):
+            nodes.append(self.term())
+        return nodes[0] if len(nodes) == 1 else ("or", nodes)
+
+    def term(self) -> Node:
+        nodes = [self.factor()]
+        while self._accept("word", "and"):
+            nodes.append(self.factor())
+        return nodes[0] if len(nodes) == 1 else ("and", nodes)
+
+    def factor(self) -> Node:
+        if self._accept("word", "not"):
+            return ("not", self.factor())
+        if self._accept("op", "("):
+            node = self.expr()
+            self._expect("op", ")")
+            return node
+
+        field = self._expect("word")
+        op = self._expect("op")
+        if field == "name" and op in _NAME_OPS:
+            return ("cmp", field, op, self._expect("string"))
+        if field == "size" and op in _SIZE_OPS:
+            return ("cmp", field, op, int(self._expect("number")))
+        raise ValueError(f"invalid condition: {field} {op}")
+
+    def _accept(self, kind: str, value: str) -> bool:
+        if self.pos < len(self.tokens) \
+                and self.tokens[self.pos] == (kind, value):
+            self.pos += 1
+            return True
+        return False
+
+    def _expect(self, kind: str, value: Optional[str] = None) -> str:
+        if self.pos >= len(self.tokens):
+            raise ValueError("unexpected end of query")
+        token_kind, token_value = self.tokens[self.pos]
+        if token_kind != kind or (value is not None and token_value != value):
+            raise ValueError(f"unexpected token {token_value!r}")
+        self.pos += 1
+        return token_value
+
+
+class Query(object):
+    """ Query compiled into a predicate over (name, size) of files.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        node, self.under = _Parser(text).parse()
+        self._namespace: dict[str, Any] = {}
+        source = self._compile(node)
+        self.predicate: Callable[[str, int], bool] = eval(
+            f"lambda name, size: {source}", self._namespace
+        )
+
+        conjuncts = node[1] if node[0] == "and" else [node]
+        # size > n が必須条件なら、合計サイズが n 以下のディレクトリは枝刈りできる
+        self.min_size = 0
+        # name ~ "*.ext" が必須条件なら、接尾辞索引から候補を引ける
+        self.suffix: Optional[str] = None
+        for c in conjuncts:
+            if c[0] != "cmp":
+                continue
+            _, field, op, value = c
+            if field == "size" and op in (">", ">="):
+                self.min_size = max(
+                    self.min_size, value + 1 if op == ">" else value
+                )
+            elif field == "name" and op == "~" and _is_suffix_glob(value):
+                self.suffix = value[1:]
+
+    def visitor(self) -> QueryVisitor:
+        return QueryVisitor(self)
+
+    def run(self, root: Entry) -> list[File]:
+        """ Return the files under root that match the query.
+        """
+        start = self._resolve(root)
+        if start is None:
+            return []
+
+        index = getattr(start, "suffix_index", None)
+        if self.suffix is not None and index is not None \
+                and index.root is start:
+            return [
+                f for f in index.find(self.suffix)
+                if self.predicate(f.get_name(), f.get_size())
+            ]
+
+        visitor = self.visitor()
+        traverse(start, visitor)
+        return visitor.found_file
+
+    def _resolve(self, root: Entry) -> Optional[Entry]:
+        """ Find the entry at the path given by `under`.
+        """
+        if self.under is None:
+            return root
+        names = [n for n in self.under.split("/") if n]
+        if not names or names[0] != root.get_name():
+            return None
+
+        entry: Optional[Entry] = root
+        for name in names[1:]:
+            if not isinstance(entry, Directory):
+                return None
+            entry = next(
+                (c for c in entry.directory if c.get_name() == name), None
+            )
+        return entry
+
+    def _compile(self, node: Node) -> str:
+        kind = node[0]
+        if kind in ("and", "or"):
+            return "(" + f" {kind} ".join(
+                self._compile(n) for n in node[1]
+            ) + ")"
+        if kind == "not":
+            return f"(not {self._compile(node[1])})"
+
+        _, field, op, value = node
+        if op == "~" and _is_suffix_glob(value):
+            return f"name.endswith({value[1:]!r})"
+        if op == "~":
+            name = f"_p{len(self._namespace)}"
+            self._namespace[name] = re.compile(translate(value)).match
+            return f"({name}(name) is not None)"
+        return f"({field} {op} {value!r})"
+
+
+class QueryVisitor(Visitor):
+    """ Visitor that collects the files matching a compiled Query.
+    """
+
+    def __init__(self, query: Union[Query, str]):
+        self.query = Query(query) if isinstance(query, str) else query
+        self.found_file: list[File] = []
+        self._predicate = self.query.predicate
+        self._min_size = self.query.min_size
+
+    def prune(self, entry: Directory) -> bool:
+        """ Skip directories too small to contain a file of min_size.
+        """
+        return self._min_size > 0 and entry.get_size() < self._min_size
+
+    def visit_file(self, entry: File) -> None:
+        if self._predicate(entry.get_name(), entry.get_size()):
+            self.found_file.append(entry)
+
+    def merge(self, other: QueryVisitor) -> None:
+        self.found_file.extend(other.found_file)
+
+    def get_found_file(self) -> list[File]:
+        return self.found_file
+
+
+if __name__ == "__main__":
+    rootdir = Directory("root")
+    usrdir = Directory("usr")
+    foo = Directory("foo")
+    rootdir.add(usrdir)
+    rootdir.add(File("top.txt", 300))
+    usrdir.add(foo)
+    foo.add(File("index.html", 200))
+    foo.add(File("memo.txt", 250))
+    foo.add(File("readme.txt", 50))
+
+    query = Query('name ~ "*.txt" and size > 100 under "/root/usr"')
+    for f in query.run(rootdir):
+        print(f)
@@ -0,0 +1,155 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(
+    os.path.dirname(__file__), os.pardir, "design_pattern", "abstract_factory"
+))
+
+from factory import ListFactory, ListLink  # noqa: E402
+
+
+class CountingLink(ListLink):
+    renders = 0
+
+    def make_html(self):
+        CountingLink.renders += 1
+        return super().make_html()
+
+
+def test_shared_tray_is_rendered_once():
+    factory = ListFactory()
+    link = CountingLink("asahi", "http://www.asahi.com/")
+    shared = factory.create_tray("news")
+    shared.add(link)
+    pages = []
+    for i in range(3):
+        page = factory.create_page(f"page{i}", "author")
+        page.add(shared)
+        pages.append(page)
+
+    CountingLink.renders = 0
+    html = [page.get_html() for page in pages]
+    assert CountingLink.renders == 1
+    assert all("asahi" in h for h in html)
+    assert [page.get_html() for page in pages] == html
+    assert CountingLink.renders == 1
+
+
+def test_changes_invalidate_containers():
+    factory = ListFactory()
+    link = CountingLink("asahi", "http://www.asahi.com/")
+    inner = factory.create_tray("inner")
+    inner.add(link)
+    outer = factory.create_tray("outer")
+    outer.add(inner)
+    page = factory.create_page("page", "author")
+    page.add(outer)
+    other = factory.create_link("other", "http://example.com/")
+    page.add(other)
+
+    CountingLink.renders = 0
+    before = page.get_html()
+    link.url = "http://www.asahi.com/news/"
+    after = page.get_html()
+    assert "http://www.asahi.com/news/" in after
+    assert after == before.replace(
+        "http://www.asahi.com/", "http://www.asahi.com/news/"
+    )
+    assert CountingLink.renders == 2
+
+    inner.add(factory.create_link("yomiuri", "http://www.yomiuri.co.jp/"))
+    assert "yomiuri" in page.get_html()
+    assert CountingLink.renders == 2
+
+    page.title = "renamed"
+    assert "<h1>renamed</h1>" in page.get_html()
+
+
+def test_iter_html_streams_without_caching(tmp_path, monkeypatch):
+    factory = ListFactory()
+    tray = factory.create_tray("links")
+    for i in range(1000):
+        tray.add(factory.create_link(f"link{i}", f"http://{i}/"))
+    page = factory.create_page("big", "author")
+    page.add(tray)
+
+    parts = list(page.iter_html())
+    assert len(parts) > 1000
+    assert tray._html is None and page._html is None
+
+    monkeypatch.chdir(tmp_path)
+    page.output(chunk_size=1024)
+    assert (tmp_path / "big.html").read_text(encoding="utf-8") \
+        == "".join(parts) == page.get_html()
+    assert list(page.iter_html()) == [page.get_html()]
+
+
+def test_publish_all_writes_atomically_and_skips_unchanged(tmp_path):
+    import pytest
+    from publish import MANIFEST, publish_all
+
+    factory = ListFactory()
+    shared = factory.create_tray("shared")
+    shared.add(factory.create_link("asahi", "http://www.asahi.com/"))
+    pages = []
+    for i in range(20):
+        page = factory.create_page(f"page{i}", "author")
+        page.add(shared)
+        pages.append(page)
+
+    report = publish_all(pages, str(tmp_path), workers=4)
+    assert report and len(report.written) == 20
+    assert (tmp_path / "page3.html").read_text(encoding="utf-8") \
+        == pages[3].get_html()
+    assert "20 written, 0 unchanged, 0 failed" in str(report)
+    before = [(tmp_path / f"page{i}.html").stat() for i in range(20)]
+
+    pages[3].add(factory.create_link("yomiuri", "http://www.yomiuri.co.jp/"))
+    report = publish_all(pages, str(tmp_path), workers=4)
+    assert report.written == [str(tmp_path / "page3.html")]
+    assert len(report.skipped) == 19
+    assert "yomiuri" in (tmp_path / "page3.html").read_text(encoding="utf-8")
+    assert sorted(p.name for p in tmp_path.iterdir()) \
+        == sorted([MANIFEST] + [f"page{i}.html" for i in range(20)])
+    after = [(tmp_path / f"page{i}.html").stat() for i in range(20)]
+    assert [(st.st_ino, st.st_mtime_ns) for st in after[4:]] \
+        == [(st.st_ino, st.st_mtime_ns) for st in before[4:]]
+
+    (tmp_path / "page7.html").write_text("edited", encoding="utf-8")
+    report = publish_all(pages, str(tmp_path), workers=4)
+    assert report.written == [str(tmp_path / "page7.html")]
+    assert (tmp_path / "page7.html").read_text(encoding="utf-8") \
+        == pages[7].get_html()
+
+    (tmp_path / "page3.html").chmod(0o640)
+    pages[3].add(factory.create_link("nikkei", "http://www.nikkei.com/"))
+    report = publish_all(pages, str(tmp_path), workers=4)
+    assert report.written == [str(tmp_path / "page3.html")]
+    assert (tmp_path / "page3.html").stat().st_mode & 0o777 == 0o640
+    assert len(list(tmp_path.iterdir())) == 21
+
+    with pytest.raises(ValueError):
+        publish_all([pages[0], pages[0]], str(tmp_path))
+
+
+def test_make_html_only_products_still_work():
+    import pytest
+    from abstract_factory import Item, Link
+
+    class HTMLOnlyLink(Link):
+        def make_html(self):
+            return f"<li>{self.caption}</li>\n"
+
+    class EmptyItem(Item):
+        pass
+
+    factory = ListFactory()
+    link = HTMLOnlyLink("asahi", "http://www.asahi.com/")
+    tray = factory.create_tray("news")
+    tray.add(link)
+    assert link.get_html() == "<li>asahi</li>\n"
+    assert "".join(tray.iter_html()) == tray.get_html()
+    assert "<li>asahi</li>" in tray.get_html()
+
+    with pytest.raises(NotImplementedError):
+        EmptyItem("empty").get_html()
@@ -0,0 +1,108 @@
+import io
+
+from design_pattern.builder import (
+    Director, HTMLBuilder, StreamingHTMLBuilder, StreamingTextBuilder,
+    TextBuilder
+)
+from design_pattern.sink import BufferSink
+
+
+class RecordingFile(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.writes = []
+
+    def write(self, text):
+        self.writes.append(len(text))
+        return super().write(text)
+
+
+def build(builder):
+    Director(builder).construct()
+    return builder
+
+
+def test_streaming_builders_write_same_document():
+    import pytest
+
+    for builder_cls, streaming_cls in (
+        (TextBuilder, StreamingTextBuilder),
+        (HTMLBuilder, StreamingHTMLBuilder),
+    ):
+        expected = build(builder_cls()).get_result()
+        fp = RecordingFile()
+        build(streaming_cls(fp, chunk_size=32))
+        assert fp.getvalue() == expected
+        assert len(fp.writes) > 1
+        assert all(n < 32 * 2 for n in fp.writes)
+
+        sink = BufferSink()
+        builder = build(streaming_cls(sink))
+        assert sink.getvalue() == expected
+        with pytest.raises(TypeError):
+            builder.get_result()
+
+
+def test_compiled_template_matches_director():
+    import pytest
+    from design_pattern.builder_template import (
+        compile_director, Slot, TemplateRecorder
+    )
+
+    sections = [
+        (Slot("s0"), Slot("i0")),
+        ("fixed", ["a", "b"]),
+        (Slot("s1"), Slot("i1")),
+    ]
+    for builder_cls in (TextBuilder, HTMLBuilder):
+        template = compile_director(
+            builder_cls, Director, Slot("title"), sections
+        )
+        for items in ([], ["x"], ["x", "y", "z"]):
+            data = dict(title="T", s0="first", i0=items, s1="last",
+                        i1=items[::-1])
+            expected = builder_cls()
+            Director(expected, "T", [
+                ("first", items), ("fixed", ["a", "b"]),
+                ("last", items[::-1]),
+            ]).construct()
+            assert template.render(**data) == expected.get_result()
+
+    class CountingBuilder(TextBuilder):
+        def make_items(self, items):
+            self._write(f"{len(items)} items\n")
+
+    with pytest.raises(ValueError):
+        Director(TemplateRecorder(CountingBuilder), "T",
+                 [("s", Slot("items"))]).construct()
+
+    class EscapingBuilder(TextBuilder):
+        def make_title(self, title):
+            super().make_title(title.replace("\0", ""))
+
+    with pytest.raises(ValueError):
+        Director(TemplateRecorder(EscapingBuilder), Slot("title"),
+                 []).construct()
+
+
+def test_build_many_keeps_input_order(tmp_path):
+    from design_pattern.builder_parallel import build_many
+
+    specs = [
+        {"title": f"T{i}", "sections": [(f"s{i}", [str(j) for j in range(i)])]}
+        for i in range(10)
+    ]
+    expected = []
+    for spec in specs:
+        builder = TextBuilder()
+        Director(builder, **spec).construct()
+        expected.append(builder.get_result())
+
+    assert build_many(specs, TextBuilder, workers=1) == expected
+    assert build_many(specs, TextBuilder, workers=2) == expected
+
+    paths = [str(tmp_path / f"{i}.html") for i in range(10)]
+    assert build_many(specs, StreamingHTMLBuilder, 2, paths) == paths
+    builder = HTMLBuilder()
+    Director(builder, **specs[3]).construct()
+    assert (tmp_path / "3.html").read_text() == builder.get_result()
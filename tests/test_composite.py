@@ -0,0 +1,271 @@
+from design_pattern.composite import Directory, File
+
+
+def make_tree():
+    root = Directory("root")
+    bindir = Directory("bin")
+    usrdir = Directory("usr")
+    root.add(bindir)
+    root.add(usrdir)
+    bindir.add(File("vi", 10000))
+    bindir.add(File("latex", 20000))
+    return root, bindir, usrdir
+
+
+def test_size_is_updated_on_add():
+    root, bindir, usrdir = make_tree()
+    usrdir.add(File("memo.txt", 250))
+    assert bindir.get_size() == 30000
+    assert usrdir.get_size() == 250
+    assert root.get_size() == 30250
+
+
+def test_size_is_updated_on_resize_and_remove():
+    root, bindir, usrdir = make_tree()
+    vi = bindir.directory[0]
+    vi.resize(500)
+    assert bindir.get_size() == 20500
+    assert root.get_size() == 20500
+
+    vi.remove()
+    assert vi.parent is None
+    assert bindir.get_size() == 20000
+    assert root.get_size() == 20000
+
+
+def test_add_moves_entry_between_directories():
+    root, bindir, usrdir = make_tree()
+    usrdir.add(bindir)
+    assert root.directory == [usrdir]
+    assert usrdir.get_size() == 30000
+    assert root.get_size() == 30000
+
+
+def test_add_rejects_entry_into_its_own_subtree():
+    import pytest
+
+    root, bindir, usrdir = make_tree()
+    for parent, entry in ((usrdir, root), (usrdir, usrdir), (bindir, root)):
+        with pytest.raises(ValueError):
+            parent.add(entry)
+    assert root.directory == [bindir, usrdir]
+    assert root.parent is None
+    assert root.get_size() == 30000
+
+
+def test_compact_tree_matches_object_tree(capsys):
+    from design_pattern.composite_compact import CompactTree
+
+    root, bindir, usrdir = make_tree()
+    root.print_list()
+    expected = capsys.readouterr().out
+
+    tree = CompactTree("root")
+    tree.root.add(bindir)
+    tree.root.add(usrdir)
+    tree.root.print_list()
+    assert capsys.readouterr().out == expected
+    assert tree.root.get_size() == 30000
+
+
+def test_compact_tree_bulk_load():
+    from design_pattern.composite_compact import CompactTree
+
+    tree = CompactTree("root")
+    tree.bulk_load([(0, "usr", None), (1, "a.txt", 10), (1, "b.txt", 20),
+                    (0, "c.txt", 5)])
+    assert tree.root.get_size() == 35
+    usr = tree.root.directory[0]
+    assert usr.get_name() == "usr"
+    assert usr.get_size() == 30
+    assert [e.get_name() for e in usr.directory] == ["a.txt", "b.txt"]
+
+    tree.bulk_load([(1, "d.txt", 1)])
+    assert usr.get_size() == 31
+    assert tree.root.get_size() == 36
+
+
+def test_compact_tree_stores_each_name_once():
+    from design_pattern.composite_compact import CompactTree
+
+    tree = CompactTree("root")
+    names = [f"名前{i}" for i in range(1000)] + ["a", "ab", "abc"]
+    tree.bulk_load([(0, name, 1) for name in names + names[::-1]])
+    assert [tree.get_name(i) for i in range(1, len(tree))] \
+        == names + names[::-1]
+    assert len(tree._names) == len("".join(["root"] + names).encode())
+
+
+def test_iter_list_handles_deep_tree():
+    root = Directory("root")
+    current = root
+    for i in range(5000):
+        child = Directory(f"d{i}")
+        current.add(child)
+        current = child
+    current.add(File("leaf", 1))
+
+    lines = list(root.iter_list())
+    assert len(lines) == 5002
+    assert lines[-1].endswith("/d4999/leaf(1)")
+
+
+def test_write_list_batches_lines():
+    class Recorder:
+        def __init__(self):
+            self.chunks = []
+
+        def write(self, text):
+            self.chunks.append(text)
+
+    root, bindir, usrdir = make_tree()
+    fp = Recorder()
+    root.write_list(fp, buffer_size=32)
+    assert "".join(fp.chunks) == "".join(f"{line}\n" for line in [
+        "/root(30000)",
+        "/root/bin(30000)",
+        "/root/bin/vi(10000)",
+        "/root/bin/latex(20000)",
+        "/root/usr(0)",
+    ])
+    assert 1 < len(fp.chunks) < 5
+
+
+def test_scan_builds_tree_from_directory(tmp_path):
+    from design_pattern.composite_scan import scan
+
+    (tmp_path / "usr").mkdir()
+    (tmp_path / "usr" / "foo").mkdir()
+    (tmp_path / "usr" / "foo" / "index.html").write_bytes(b"x" * 200)
+    (tmp_path / "memo.txt").write_bytes(b"x" * 50)
+
+    root = scan(tmp_path, workers=4)
+    name = tmp_path.name
+    assert root.get_size() == 250
+    assert list(root.iter_list()) == [
+        f"/{name}(250)",
+        f"/{name}/usr(200)",
+        f"/{name}/usr/foo(200)",
+        f"/{name}/usr/foo/index.html(200)",
+        f"/{name}/memo.txt(50)",
+    ]
+
+
+def test_path_index_follows_add_and_remove():
+    from design_pattern.composite_index import PathIndex
+
+    root, bindir, usrdir = make_tree()
+    index = PathIndex(root)
+    assert index.lookup("/root/bin/vi") is bindir.directory[0]
+
+    foo = Directory("foo")
+    usrdir.add(foo)
+    foo.add(File("index.html", 200))
+    foo.add(File("memo.txt", 250))
+    assert index.lookup("/root/usr/foo/") is foo
+    assert [e.get_name() for e in index.glob("/root/**/*.html")] == [
+        "index.html"
+    ]
+    assert [e.get_name() for e in index.glob("/root/*/*")] == [
+        "vi", "latex", "foo"
+    ]
+
+    bindir.add(foo)
+    assert index.lookup("/root/usr/foo") is None
+    assert index.lookup("/root/bin/foo/memo.txt").get_size() == 250
+
+    root.remove(bindir)
+    assert index.lookup("/root/bin") is None
+    assert index.glob("/root/**/*.html") == []
+
+
+def test_path_index_glob_double_star():
+    from design_pattern.composite_index import PathIndex
+
+    root, bindir, usrdir = make_tree()
+    index = PathIndex(root)
+    foo = Directory("foo")
+    usrdir.add(foo)
+    foo.add(File("index.html", 200))
+    usrdir.add(File("a.html", 1))
+    bindir.add(File("b.htm", 1))
+
+    names = lambda entries: [e.get_name() for e in entries]  # noqa: E731
+    assert names(index.glob("/root/**/*.html")) == ["a.html", "index.html"]
+    assert names(index.glob("/root/**/*.htm*")) == [
+        "b.htm", "a.html", "index.html"
+    ]
+    assert names(index.glob("/root/usr/**")) == [
+        "usr", "a.html", "foo", "index.html"
+    ]
+    assert names(index.glob("/root/**/[!u]*/*.html")) == ["index.html"]
+    assert names(index.glob("/root/**/foo/**/*")) == ["index.html"]
+
+    root.add(foo)
+    assert names(index.glob("/root/usr/**/*.html")) == ["a.html"]
+
+
+def test_snapshot_round_trip(tmp_path, capsys):
+    from design_pattern.composite_snapshot import load, save
+
+    root, bindir, usrdir = make_tree()
+    usrdir.add(File("インデックス.html", 200))
+    root.print_list()
+    expected = capsys.readouterr().out
+
+    filename = tmp_path / "tree.snapshot"
+    save(root, filename)
+    loaded = load(filename)
+    assert loaded.get_size() == 30200
+    assert loaded._loaded is False
+
+    loaded.print_list()
+    assert capsys.readouterr().out == expected
+
+    loaded.directory[1].add(File("memo.txt", 50))
+    assert loaded.get_size() == 30250
+
+
+def test_snapshot_of_visitor_tree(tmp_path):
+    from design_pattern import visitor
+    from design_pattern.composite_snapshot import load, save
+
+    root = visitor.Directory("root")
+    root.add(visitor.File("vi.md", 10000))
+    save(root, tmp_path / "tree.snapshot")
+    assert list(load(tmp_path / "tree.snapshot").iter_list()) == [
+        "/root(10000)",
+        "/root/vi.md(10000)",
+    ]
+
+
+def test_hash_is_invalidated_on_mutation():
+    root, bindir, usrdir = make_tree()
+    other, _, _ = make_tree()
+    assert root.get_hash() == other.get_hash()
+
+    bindir.directory[0].resize(1)
+    assert root.get_hash() != other.get_hash()
+    bindir.directory[0].resize(10000)
+    assert root.get_hash() == other.get_hash()
+
+    usrdir.add(Directory("foo"))
+    assert root.get_hash() != other.get_hash()
+
+
+def test_diff_reports_changed_entries():
+    from design_pattern.composite_diff import diff
+
+    old, _, _ = make_tree()
+    new, bindir, usrdir = make_tree()
+    assert not diff(old, new)
+
+    bindir.directory[0].resize(12000)
+    bindir.directory[1].remove()
+    usrdir.add(File("memo.txt", 250))
+    usrdir.add(Directory("foo"))
+
+    result = diff(old, new)
+    assert result.added == ["/root/usr/memo.txt", "/root/usr/foo"]
+    assert result.removed == ["/root/bin/latex"]
+    assert result.resized == [("/root/bin/vi", 10000, 12000)]
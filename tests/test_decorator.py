@@ -0,0 +1,116 @@
+from design_pattern.decorator import (
+    Boader, FullBoader, MultiStringDisplay, SideBoader, StringDisplay,
+    UpDownBoader
+)
+
+
+def rows(display):
+    return [display.get_row_text(i) for i in range(display.get_rows())]
+
+
+def make_nested():
+    ms = MultiStringDisplay()
+    ms.add("Hello")
+    ms.add("Good Morning")
+    ms.add("Good Night")
+    return SideBoader(
+        FullBoader(UpDownBoader(FullBoader(SideBoader(
+            UpDownBoader(ms, "/"), "*"
+        )), "=")),
+        "#",
+    )
+
+
+def test_compile_matches_rows():
+    for display in (
+        StringDisplay("Hello World"),
+        FullBoader(SideBoader(StringDisplay("Hello World"), "#")),
+        make_nested(),
+    ):
+        compiled = display.compile()
+        assert compiled.get_columns() == display.get_columns()
+        assert rows(compiled) == rows(display)
+        assert compiled.render() == "\n".join(rows(display))
+
+
+def test_compile_deep_nest():
+    display = StringDisplay("x")
+    for i in range(2000):
+        display = FullBoader(display) if i % 2 else SideBoader(display, "#")
+    compiled = display.compile()
+    assert compiled.get_rows() == 2001
+    assert compiled.get_columns() == 4001
+    assert compiled.get_row_text(1000) == "|#" * 1000 + "x" + "#|" * 1000
+
+
+def test_compile_custom_boader_falls_back_to_rows():
+    class BracketBoader(Boader):
+        def get_columns(self):
+            return self.display.get_columns() + 2
+
+        def get_rows(self):
+            return self.display.get_rows()
+
+        def get_row_text(self, row):
+            return f"[{self.display.get_row_text(row)}]"
+
+    display = FullBoader(BracketBoader(SideBoader(StringDisplay("a"), "*")))
+    assert rows(display.compile()) == rows(display)
+
+
+def test_multi_string_width_is_tracked_on_add():
+    ms = MultiStringDisplay()
+    for string in ("a", "abc", "ab"):
+        ms.add(string)
+    assert ms.get_columns() == 3
+    assert rows(ms) == ["a  ", "abc", "ab "]
+
+
+def test_multi_string_reads_iterable_on_first_use():
+    read = []
+
+    def lines():
+        for i in range(5):
+            read.append(i)
+            yield "x" * i
+
+    ms = MultiStringDisplay(lines())
+    assert read == []
+    assert ms.get_row_text(0) == "    "
+    assert read == [0, 1, 2, 3, 4]
+    assert ms.get_rows() == 5
+    assert ms.get_columns() == 4
+    assert rows(SideBoader(ms, "|"))[2] == "|xx  |"
+
+
+def test_multi_string_from_file_shows_window(tmp_path, capsys):
+    path = tmp_path / "log.txt"
+    path.write_text("".join(f"line {i}\n" for i in range(1000)))
+    ms = MultiStringDisplay.from_file(str(path))
+    try:
+        assert ms.get_rows() == 1000
+        assert ms.get_columns() == 8
+        FullBoader(ms).show(500, 502)
+        assert capsys.readouterr().out == "|line 499|\n|line 500|\n"
+        ms.add("last")
+        assert ms.get_row_text(1000) == "last    "
+        assert ms.compile().get_row_text(999) == "line 999"
+    finally:
+        ms.close()
+
+
+def test_boaders_align_wide_characters():
+    ms = MultiStringDisplay()
+    ms.add("Hello")
+    ms.add("こんにちは")
+    display = FullBoader(UpDownBoader(SideBoader(ms, "＃"), "＝"))
+    assert display.get_columns() == 16
+    assert rows(display) == [
+        "+--------------+",
+        "|＝＝＝＝＝＝＝|",
+        "|＃Hello     ＃|",
+        "|＃こんにちは＃|",
+        "|＝＝＝＝＝＝＝|",
+        "+--------------+",
+    ]
+    assert rows(display.compile()) == rows(display)
@@ -0,0 +1,56 @@
+from design_pattern import bridge, prototype, template
+from design_pattern.composite import Directory, File
+from design_pattern.decorator import FullBoader, StringDisplay
+from design_pattern.sink import BufferSink, FileSink, NullSink, StdoutSink
+
+
+def test_stdout_sink_buffers_until_flush(capsys):
+    sink = StdoutSink(buffer_size=10)
+    sink.write_line("abc")
+    assert capsys.readouterr().out == ""
+    sink.write_line("defghij")
+    assert capsys.readouterr().out == "abc\ndefghij\n"
+    sink.write_line("k")
+    sink.close()
+    assert capsys.readouterr().out == "k\n"
+
+
+def test_file_sink(tmp_path):
+    path = tmp_path / "out.txt"
+    with FileSink(str(path), buffer_size=4) as sink:
+        for i in range(3):
+            sink.write_line(f"line {i}")
+    assert path.read_text() == "line 0\nline 1\nline 2\n"
+
+
+def test_display_paths_write_to_sink(capsys):
+    sink = BufferSink()
+    FullBoader(StringDisplay("hi")).show(sink=sink)
+    template.StringDisplay("ab").display(sink)
+    bridge.CountDisplay(bridge.StringDisplay("x")).multi_display(2, sink)
+    prototype.UnderLinePen("~").use("ab", sink)
+    root = Directory("root")
+    root.add(File("a", 1))
+    root.print_list(sink=sink)
+    assert sink.getvalue() == (
+        "+--+\n|hi|\n+--+\n"
+        "+--+\n" + "|ab|\n" * 5 + "+--+\n"
+        + "-" * 10 + "\nx\nx\n" + "-" * 10 + "\n"
+        '"ab"\n ~~ \n'
+        "/root(1)\n/root/a(1)\n"
+    )
+    assert capsys.readouterr().out == ""
+
+    prototype.MessageBox("*").use("ab", NullSink())
+    prototype.MessageBox("*").use("ab")
+    assert capsys.readouterr().out == "******\n\n* ab *\n\n******\n"
+
+
+def test_display_steps_take_the_sink(capsys):
+    sink = BufferSink()
+    template.CharDisplay("c").open(sink)
+    bridge.Display(bridge.StringDisplay("x")).print(sink)
+    assert sink.getvalue() == "<<\nx\n"
+
+    template.CharDisplay("c").close()
+    assert capsys.readouterr().out == ">>\n"
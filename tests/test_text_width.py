@@ -0,0 +1,18 @@
+from design_pattern.text_width import char_width, ljust, repeat, width
+
+
+def test_width_counts_wide_characters_as_two():
+    assert width("") == 0
+    assert width("Hello World") == 11
+    assert width("test てすと") == 11
+    assert width("ﾃｽﾄ") == 3
+    assert width("①") == 2  # ambiguous width counts as wide
+    assert char_width("あ") == 2
+    assert char_width("a") == 1
+
+
+def test_padding_uses_display_width():
+    assert ljust("てすと", 8) == "てすと  "
+    assert repeat("=", 5) == "====="
+    assert repeat("＝", 5) == "＝＝ "
+    assert repeat("", 5) == ""
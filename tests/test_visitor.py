@@ -0,0 +1,354 @@
+from design_pattern.visitor import (
+    Directory, File, FileFindVisitor, ListVisitor, MultiVisitor, SizeVisitor
+)
+
+
+def make_tree():
+    root = Directory("root")
+    bindir = Directory("bin")
+    usrdir = Directory("usr")
+    foo = Directory("foo")
+    root.add(bindir)
+    root.add(usrdir)
+    bindir.add(File("vi.md", 10000))
+    usrdir.add(foo)
+    foo.add(File("index.html", 200))
+    foo.add(File("memo.txt", 250))
+    usrdir.add(File("sample.html", 500))
+    return root
+
+
+def test_list_visitor(capsys):
+    make_tree().accept(ListVisitor())
+    assert capsys.readouterr().out.splitlines() == [
+        "/root(10950)",
+        "//root/bin(10000)",
+        "//root//bin/vi.md(10000)",
+        "//root/usr(950)",
+        "//root//usr/foo(450)",
+        "//root//usr//foo/index.html(200)",
+        "//root//usr//foo/memo.txt(250)",
+        "//root//usr/sample.html(500)",
+    ]
+
+
+def test_file_find_visitor():
+    ffv = FileFindVisitor(".html")
+    make_tree().accept(ffv)
+    assert [f.get_name() for f in ffv.get_found_file()] == [
+        "index.html", "sample.html"
+    ]
+
+
+def test_size_visitor_handles_deep_tree_and_subclasses():
+    class LinkFile(File):
+        pass
+
+    root = Directory("root")
+    current = root
+    for i in range(5000):
+        child = Directory(f"d{i}")
+        current.add(child)
+        current = child
+    current.add(LinkFile("leaf", 7))
+
+    sv = SizeVisitor()
+    root.accept(sv)
+    assert sv.get_size() == 7
+
+
+def test_multi_visitor_keeps_results_separate(capsys):
+    root = make_tree()
+    root.accept(ListVisitor())
+    expected = capsys.readouterr().out
+
+    sv = SizeVisitor()
+    ffv = FileFindVisitor(".html")
+    root.accept(MultiVisitor(sv, ListVisitor(), ffv))
+    assert capsys.readouterr().out == expected
+    assert sv.get_size() == 10950
+    assert [f.get_name() for f in ffv.get_found_file()] == [
+        "index.html", "sample.html"
+    ]
+
+
+def test_parallel_visit_matches_serial_run():
+    from design_pattern.visitor_parallel import parallel_visit
+
+    root = make_tree()
+    for i in range(10):
+        d = Directory(f"d{i}")
+        root.add(d)
+        d.add(File(f"f{i}.html", i))
+
+    sv = parallel_visit(root, SizeVisitor, workers=2)
+    assert sv.get_size() == root.get_size()
+
+    serial = FileFindVisitor(".html")
+    root.accept(serial)
+    ffv = parallel_visit(root, FileFindVisitor, ".html", workers=2)
+    assert len(ffv.get_found_file()) == 12
+    assert all(
+        a is b for a, b in zip(ffv.get_found_file(), serial.get_found_file())
+    )
+
+
+def test_suffix_index_is_updated_on_add():
+    from design_pattern.visitor import SuffixIndex, traverse
+
+    root = make_tree()
+    index = SuffixIndex(root)
+    foo = root.directory[1].directory[0]
+    foo.add(File("about.html", 10))
+    bar = Directory("bar")
+    bar.add(File("top.html", 20))
+    root.add(bar)
+
+    assert [f.get_name() for f in index.find(".html")] == [
+        "index.html", "about.html", "sample.html", "top.html"
+    ]
+    assert [f.get_name() for f in index.find("t.html")] == ["about.html"]
+    assert index.find(".pdf") == []
+
+    walked = FileFindVisitor(".html")
+    traverse(root, walked)
+    ffv = FileFindVisitor(".html")
+    root.accept(ffv)
+    assert ffv.get_found_file() == walked.get_found_file()
+
+    root.directory[0].add(File("bin.html", 1))
+    ffv = FileFindVisitor(".html", limit=2)
+    root.accept(ffv)
+    assert [f.get_name() for f in ffv.get_found_file()] == [
+        "bin.html", "index.html"
+    ]
+
+
+def test_add_moves_entry_from_its_old_directory():
+    from design_pattern.visitor import SuffixIndex
+
+    root = make_tree()
+    index = SuffixIndex(root)
+    a = Directory("a")
+    b = Directory("b")
+    s = Directory("s")
+    root.add(a)
+    root.add(b)
+    a.add(s)
+    b.add(s)
+    assert a.get_size() == 0
+    s.add(File("x.html", 5))
+    assert a.directory == [] and b.directory == [s] and s.parent is b
+    assert a.get_size() == 0
+    assert b.get_size() == 5
+    assert root.get_size() == 10955
+
+    other = Directory("other")
+    other.add(s)
+    assert b.get_size() == 0
+    assert s.suffix_index is None
+    assert [f.get_name() for f in index.find(".html")] == [
+        "index.html", "sample.html"
+    ]
+
+
+def test_add_rejects_entry_into_its_own_subtree():
+    import pytest
+
+    root = make_tree()
+    usrdir = root.directory[1]
+    foo = usrdir.directory[0]
+    for parent, entry in ((foo, root), (usrdir, usrdir), (foo, usrdir)):
+        with pytest.raises(ValueError):
+            parent.add(entry)
+    assert root.parent is None and usrdir.parent is root
+    assert root.get_size() == 10950
+
+
+def test_nested_suffix_indexes_are_both_updated():
+    from design_pattern.visitor import SuffixIndex, traverse
+
+    root = make_tree()
+    usrdir = root.directory[1]
+    outer = SuffixIndex(root)
+    inner = SuffixIndex(usrdir)
+    usrdir.add(File("b.html", 1))
+    usrdir.directory[0].add(File("c.html", 2))
+    root.directory[0].add(usrdir.directory[0])
+
+    for start, index in ((root, outer), (usrdir, inner)):
+        walked = FileFindVisitor(".html")
+        traverse(start, walked)
+        ffv = FileFindVisitor(".html")
+        start.accept(ffv)
+        assert ffv.get_found_file() == walked.get_found_file()
+        assert index.find(".html") == walked.get_found_file()
+    assert [f.get_name() for f in inner.find(".html")] == [
+        "sample.html", "b.html"
+    ]
+
+
+def test_visitor_cache_recomputes_changed_paths_only():
+    from design_pattern.visitor import VisitorCache
+
+    root = make_tree()
+    cache = VisitorCache(maxsize=2)
+    assert cache.visit(root, SizeVisitor).get_size() == 10950
+    assert len(cache) == 2
+
+    foo = root.directory[1].directory[0]
+    foo.add(File("about.html", 10))
+    assert cache.visit(root, SizeVisitor).get_size() == 10960
+    assert [f.get_name() for f in
+            cache.visit(root, FileFindVisitor, ".html").get_found_file()] == [
+        "index.html", "about.html", "sample.html"
+    ]
+    assert root.get_size() == 10960
+    assert foo.get_size() == 460
+
+
+def test_visitor_cache_does_not_keep_trees_alive():
+    import gc
+    import weakref
+    from design_pattern.visitor import VisitorCache
+
+    root = make_tree()
+    cache = VisitorCache()
+    assert cache.visit(root, SizeVisitor).get_size() == 10950
+    assert root.get_size() == 10950
+    ref = weakref.ref(root)
+    del root
+    gc.collect()
+    assert ref() is None
+    assert len(cache) == 0
+
+
+def test_control_signals_and_prune():
+    from design_pattern.visitor import Control, Visitor, traverse
+
+    class NameVisitor(Visitor):
+        def __init__(self, skip="", stop="", pruned=""):
+            self.skip = skip
+            self.stop = stop
+            self.pruned = pruned
+            self.names = []
+            self.left = []
+
+        def prune(self, entry):
+            return entry.get_name() == self.pruned
+
+        def visit_directory(self, entry):
+            return self.visit_file(entry)
+
+        def visit_file(self, entry):
+            self.names.append(entry.get_name())
+            if entry.get_name() == self.stop:
+                return Control.STOP
+            if entry.get_name() == self.skip:
+                return Control.SKIP_CHILDREN
+            return None
+
+        def leave_directory(self, entry):
+            self.left.append(entry.get_name())
+
+    root = make_tree()
+    skipping = NameVisitor(skip="usr")
+    stopping = NameVisitor(stop="index.html")
+    pruning = NameVisitor(pruned="foo")
+    traverse(root, skipping, stopping, pruning)
+
+    assert skipping.names == ["root", "bin", "vi.md", "usr"]
+    assert skipping.left == ["bin", "usr", "root"]
+    assert stopping.names == ["root", "bin", "vi.md", "usr", "foo",
+                              "index.html"]
+    assert stopping.left == ["bin"]
+    assert pruning.names == ["root", "bin", "vi.md", "usr", "sample.html"]
+
+    single = NameVisitor(stop="index.html")
+    root.accept(single)
+    assert single.names == stopping.names
+
+
+def test_file_find_visitor_limit():
+    from design_pattern.visitor import SuffixIndex
+
+    root = make_tree()
+    first = FileFindVisitor(".html", limit=1)
+    root.accept(first)
+    assert first.get_first_file().get_name() == "index.html"
+    assert len(first.get_found_file()) == 1
+
+    SuffixIndex(root)
+    limited = FileFindVisitor(".html", limit=1)
+    root.accept(limited)
+    assert limited.get_found_file() == first.get_found_file()
+
+
+def test_query_compiles_conditions():
+    from design_pattern.visitor import SuffixIndex
+    from design_pattern.visitor_query import Query
+
+    root = make_tree()
+    names = lambda files: [f.get_name() for f in files]  # noqa: E731
+
+    assert names(Query('name ~ "*.html"').run(root)) == [
+        "index.html", "sample.html"
+    ]
+    assert names(Query('name ~ "*.html" and size > 300').run(root)) == [
+        "sample.html"
+    ]
+    assert names(Query(
+        'not (name == "vi.md" or size < 250) under "/root/usr"'
+    ).run(root)) == ["memo.txt", "sample.html"]
+    assert Query('size >= 0 under "/root/tmp"').run(root) == []
+
+    SuffixIndex(root)
+    query = Query('name ~ "*.html" and size <= 300')
+    assert query.suffix == ".html"
+    assert names(query.run(root)) == ["index.html"]
+
+
+def test_query_rejects_invalid_syntax():
+    import pytest
+    from design_pattern.visitor_query import Query
+
+    for text in ('name > "a"', 'size ~ 1', 'name ~ "a" and', 'size = 1'):
+        with pytest.raises(ValueError):
+            Query(text)
+
+
+def test_async_visitor_preserves_order_and_bounds_concurrency():
+    import asyncio
+    import random
+    from design_pattern.visitor_async import AsyncVisitor
+
+    class SlowNameVisitor(AsyncVisitor):
+        concurrency = 3
+
+        def __init__(self):
+            self.names = []
+            self.running = 0
+            self.peak = 0
+
+        async def visit_file(self, entry):
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+            await asyncio.sleep(random.uniform(0, 0.01))
+            self.running -= 1
+            return entry.get_name()
+
+        async def visit_directory(self, entry):
+            return entry.get_name()
+
+        def prune(self, entry):
+            return entry.get_name() == "bin"
+
+        def collect(self, entry, result):
+            self.names.append(result)
+
+    visitor = SlowNameVisitor()
+    asyncio.run(visitor.visit(make_tree()))
+    assert visitor.names == [
+        "root", "usr", "foo", "index.html", "memo.txt", "sample.html"
+    ]
+    assert visitor.peak <= 3